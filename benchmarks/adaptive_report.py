@@ -0,0 +1,88 @@
+"""Evaluations to reach the same best fitness with fixed and adaptive operator settings.
+
+For every spec the target is the median best fitness of the fixed-setting GA over a full run on
+calibration seeds. Both settings then run on other seeds until they reach it (or three times
+the generations), counting the distinct genomes they had to evaluate:
+
+    python -m benchmarks.adaptive_report --seeds 20
+
+Reports mean, median and p90 evaluations, the share of runs that reached the target and the
+change of the mean from fixed to adaptive.
+"""
+import argparse
+import json
+import sys
+
+import numpy as np
+
+from optimiser.optimiser_core import ClosetOptimiser
+
+# Standard specs with their width-derived column counts (4, 6, 7, 3 and 8)
+SPECS = [
+    {"name": "standard_3_comp", "width": 2540, "height": 2176,
+     "preferences": {"shelves": 30, "drawers": 20, "short_hanging": 50}},
+    {"name": "hanging_heavy", "width": 3600, "height": 2400,
+     "preferences": {"shelves": 10, "drawers": 10, "short_hanging": 40, "long_hanging": 40}},
+    {"name": "wide_4_comp", "width": 4200, "height": 2176,
+     "preferences": {"shelves": 35, "drawers": 15, "short_hanging": 30, "long_hanging": 20}},
+    {"name": "short_wall", "width": 1800, "height": 2000,
+     "preferences": {"shelves": 45, "drawers": 25, "short_hanging": 30}},
+    {"name": "full_wall", "width": 5000, "height": 2400,
+     "preferences": {"shelves": 20, "drawers": 30, "short_hanging": 25, "long_hanging": 25}},
+]
+
+
+def run(spec, population, generations, seed, adaptive, target_fitness=None):
+    """One seeded run, returning (best fitness, distinct evaluations, reached target)"""
+    optimiser = ClosetOptimiser(spec["width"], spec["height"], spec["preferences"],
+                                {"Population": population, "Generations": generations})
+    best, _ = optimiser.optimise(seed=seed, plot=False, adaptive=adaptive, target_fitness=target_fitness, heuristic_seeds=0)
+    return best.fitness.values[0], optimiser.cache.misses, optimiser.logbook.stop_reason == "target"
+
+
+def summarise(runs):
+    evaluations = np.array([evaluations for _, evaluations, _ in runs])
+    return {
+        "mean": float(evaluations.mean()),
+        "median": float(np.median(evaluations)),
+        "p90": float(np.percentile(evaluations, 90)),
+        "reached": float(np.mean([reached for _, _, reached in runs])),
+    }
+
+
+def compare(spec, population, generations, seeds, calibration_seeds):
+    finals = [run(spec, population, generations, seed, False)[0] for seed in range(calibration_seeds)]
+    target = float(np.median(finals)) - 1e-6
+    seeds = range(1000, 1000 + seeds)  # Disjoint from the calibration seeds
+    fixed = summarise([run(spec, population, 3 * generations, seed, False, target) for seed in seeds])
+    adaptive = summarise([run(spec, population, 3 * generations, seed, True, target) for seed in seeds])
+    return {"target": target, "fixed": fixed, "adaptive": adaptive,
+            "mean_change": adaptive["mean"] / fixed["mean"] - 1}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare evaluations to target with fixed and adaptive operators.")
+    parser.add_argument("--seeds", type=int, default=20, help="Seeded runs per spec and setting")
+    parser.add_argument("--calibration-seeds", type=int, default=10, help="Fixed-setting runs that set each target")
+    parser.add_argument("--population", type=int, default=100, help="Population size")
+    parser.add_argument("--generations", type=int, default=100, help="Generations of the calibration runs")
+    parser.add_argument("--spec", action="append", help="Only run the named spec (repeatable)")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for spec in SPECS:
+        if args.spec and spec["name"] not in args.spec:
+            continue
+        results[spec["name"]] = compare(spec, args.population, args.generations, args.seeds, args.calibration_seeds)
+        print(f"{spec['name']}: {json.dumps(results[spec['name']])}", file=sys.stderr)
+
+    fixed = sum(result["fixed"]["mean"] for result in results.values())
+    adaptive = sum(result["adaptive"]["mean"] for result in results.values())
+    report = {"results": results, "total_mean_evaluations": {"fixed": fixed, "adaptive": adaptive,
+                                                              "change": adaptive / fixed - 1 if fixed else 0.0}}
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,198 @@
+"""Speed and quality benchmarks for ClosetOptimiser.
+
+Runs a fixed set of seeded closet specs and records evaluations per second, generations per
+second, time to reach a target fitness, peak memory and final best fitness (next to the exact
+engine's optimum) as JSON:
+
+    python -m benchmarks.bench_optimiser -o before.json
+    python -m benchmarks.bench_optimiser -o after.json
+    python -m benchmarks.bench_optimiser --compare before.json after.json
+
+--compare exits with status 1 when a spec got slower or worse beyond the tolerances.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+from optimiser.optimiser_core import ClosetOptimiser
+
+# Fixed specs, each run with its own seed so results are comparable between commits. The column
+# count is pinned to the original four columns so width-derived columns do not change the problems.
+# Each target sits just under the spec's exact optimum, which no initial population reaches and
+# the seeded runs reach after 5 to 35 generations at either size
+SPECS = [
+    {"name": "standard_3_comp", "width": 2540, "height": 2176, "seed": 1, "target": -6.62,
+     "preferences": {"shelves": 30, "drawers": 20, "short_hanging": 50, "long_hanging": 0}},
+    {"name": "all_4_comp", "width": 2540, "height": 2176, "seed": 2, "target": -15.45,
+     "preferences": {"shelves": 25, "drawers": 25, "short_hanging": 25, "long_hanging": 25}},
+    {"name": "short_wall_shelves", "width": 1200, "height": 1600, "seed": 3, "target": -3.01,
+     "preferences": {"shelves": 70, "drawers": 30, "short_hanging": 0, "long_hanging": 0}},
+    {"name": "hanging_heavy", "width": 3600, "height": 2400, "seed": 4, "target": -20.01,
+     "preferences": {"shelves": 10, "drawers": 10, "short_hanging": 40, "long_hanging": 40}},
+]
+FULL = {"population": 500, "generations": 100, "target_generations": 1000, "eval_genomes": 5000}
+QUICK = {"population": 100, "generations": 20, "target_generations": 200, "eval_genomes": 1000}
+
+
+def bench_evaluations(optimiser, num_genomes, seed):
+    """Evaluations per second for the scalar and vectorised fitness functions"""
+    optimiser.rng.seed(seed)
+    genomes = [list(ind) for ind in optimiser.toolbox.population(n=num_genomes)]
+
+    start = time.perf_counter()
+    for genome in genomes:
+        optimiser.evaluate(genome)
+    scalar = num_genomes / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    optimiser.evaluate_population(genomes)
+    batch = num_genomes / (time.perf_counter() - start)
+
+    return {"scalar": scalar, "batch": batch}
+
+
+def bench_spec(spec, sizes, measure_memory=True):
+    """Run every measurement for one spec"""
+    alg_pref = {"Population": sizes["population"], "Generations": sizes["generations"]}
+
+    def make_optimiser():
+        return ClosetOptimiser(spec["width"], spec["height"], spec["preferences"], alg_pref, columns=spec.get("columns", 4))
+
+    result = {"evals_per_second": bench_evaluations(make_optimiser(), sizes["eval_genomes"], spec["seed"])}
+
+    # Fixed length run for throughput and final quality
+    optimiser = make_optimiser()
+    start = time.perf_counter()
+    best, _ = optimiser.optimise(seed=spec["seed"], plot=False)
+    elapsed = time.perf_counter() - start
+    result["generations_per_second"] = len(optimiser.logbook) / elapsed
+    result["wall_time"] = elapsed
+    result["final_best_fitness"] = best.fitness.values[0]
+
+    # Provable optimum from the exact engine, so the GA's gap can be tracked (None when it fell back to the GA)
+    optimiser = make_optimiser()
+    best, _ = optimiser.optimise(engine="exact", plot=False)
+    result["exact_best_fitness"] = best.fitness.values[0] if optimiser.logbook.stop_reason == "exact" else None
+
+    # Run until the target fitness is reached, or the generation cap
+    optimiser = make_optimiser()
+    start = time.perf_counter()
+    best, _ = optimiser.optimise(generations=sizes["target_generations"], seed=spec["seed"],
+                                 target_fitness=spec["target"], plot=False)
+    reached = optimiser.logbook.stop_reason == "target"
+    result["time_to_target"] = time.perf_counter() - start if reached else None
+    result["generations_to_target"] = len(optimiser.logbook) if reached else None
+
+    # Peak Python memory of a fixed length run, measured separately as tracing slows the run down
+    if measure_memory:
+        optimiser = make_optimiser()
+        tracemalloc.start()
+        optimiser.optimise(seed=spec["seed"], plot=False)
+        result["peak_memory_bytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return result
+
+
+def environment():
+    """Describe the machine and code version the results came from"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    import deap
+    import numpy
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": numpy.__version__,
+        "deap": deap.__version__,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def run(quick=False, measure_memory=True, names=None):
+    sizes = QUICK if quick else FULL
+    results = {}
+    for spec in SPECS:
+        if names and spec["name"] not in names:
+            continue
+        results[spec["name"]] = bench_spec(spec, sizes, measure_memory)
+        print(f"{spec['name']}: {json.dumps(results[spec['name']])}", file=sys.stderr)
+    return {"environment": environment(), "sizes": sizes, "results": results}
+
+
+def compare(before, after, speed_tolerance=0.2, fitness_tolerance=0.5):
+    """Print a side-by-side comparison, returning the list of regressions"""
+    regressions = []
+    rows = [
+        ("batch evals/s", lambda r: r["evals_per_second"]["batch"], True),
+        ("scalar evals/s", lambda r: r["evals_per_second"]["scalar"], True),
+        ("gens/s", lambda r: r["generations_per_second"], True),
+        ("time to target", lambda r: r["time_to_target"], False),
+        ("peak memory", lambda r: r.get("peak_memory_bytes"), False),
+    ]
+    for name in before["results"]:
+        if name not in after["results"]:
+            continue
+        old, new = before["results"][name], after["results"][name]
+        print(name)
+        for label, value, higher_is_better in rows:
+            a, b = value(old), value(new)
+            if a is None or b is None:
+                print(f"  {label:<16}{a!s:>14}{b!s:>14}")
+                continue
+            change = (b - a) / a if a else 0.0
+            print(f"  {label:<16}{a:>14.4g}{b:>14.4g}{change:>+10.1%}")
+            if (change < -speed_tolerance) if higher_is_better else (change > speed_tolerance):
+                regressions.append(f"{name}: {label} {change:+.1%}")
+
+        a, b = old["final_best_fitness"], new["final_best_fitness"]
+        print(f"  {'best fitness':<16}{a:>14.4f}{b:>14.4f}{b - a:>+10.3f}")
+        if b < a - fitness_tolerance:
+            regressions.append(f"{name}: best fitness {b - a:+.3f}")
+        if old["time_to_target"] is not None and new["time_to_target"] is None:
+            regressions.append(f"{name}: target fitness no longer reached")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark ClosetOptimiser speed and solution quality.")
+    parser.add_argument("-o", "--output", help="Write the JSON results to this file (default: stdout)")
+    parser.add_argument("--quick", action="store_true", help="Smaller populations and runs for a fast check")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the traced peak memory run")
+    parser.add_argument("--spec", action="append", help="Only run the named spec (repeatable)")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="Compare two result files")
+    parser.add_argument("--speed-tolerance", type=float, default=0.2, help="Allowed relative slowdown (default 0.2)")
+    parser.add_argument("--fitness-tolerance", type=float, default=0.5, help="Allowed best fitness drop (default 0.5)")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        with open(args.compare[0]) as f:
+            before = json.load(f)
+        with open(args.compare[1]) as f:
+            after = json.load(f)
+        regressions = compare(before, after, args.speed_tolerance, args.fitness_tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+
+    report = json.dumps(run(args.quick, not args.no_memory, args.spec), indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report + "\n")
+    else:
+        print(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+"""Memory check for a long design session in the GUI.
+
+Runs many optimisations through the GUI's persistent figures the way the window does (reset,
+live updates, final draw) on an Agg canvas, so no display is needed:
+
+    python -m benchmarks.gui_memory --runs 100 --max-growth 2
+
+Reports Python heap growth (tracemalloc) and resident set size growth between the end of the
+warm-up runs and the last run. Exits with status 1 when the heap grows more than --max-growth MB.
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import tracemalloc
+
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+PREFERENCES = {"shelves": 30, "drawers": 20, "short_hanging": 50, "long_hanging": 0}
+
+
+def rss_mb():
+    """Current resident set size in MB, None where /proc is unavailable"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except (OSError, ValueError):
+        return None
+
+
+def run_session(runs=100, warmup=10, population=30, generations=5, dpi=30, draw_every=1):
+    """Optimise runs + warmup designs into one LiveFigures, returning heap and RSS growth after the warm-up.
+
+    The canvases are drawn after every draw_every-th run, drawing dominates the time of a session.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from optimiser.optimiser_core import ClosetOptimiser
+    from optimiser.visualiser import LiveFigures
+
+    live = LiveFigures(dpi=dpi)
+    for figure in live.figures:
+        FigureCanvasAgg(figure)
+
+    def optimise(index):
+        width = 2000 + 10 * (index % 50)
+        optimiser = ClosetOptimiser(width, 2176, PREFERENCES, {"Population": population, "Generations": generations})
+        live.reset(width, optimiser.height, optimiser.columns)
+        history = {"gen": [], "max": [], "avg": []}
+
+        def report(gen, record, best_individual):
+            for key in history:
+                history[key].append(gen if key == "gen" else record[key])
+            live.show(optimiser.map_individual_to_arrangement(best_individual), width, optimiser.height,
+                      optimiser.columns, history["gen"], history["max"], history["avg"])
+
+        optimiser.optimise(seed=index, callback=report, plot=False, warm_start=True)
+        if index % draw_every == 0:
+            live.draw_idle()
+
+    for index in range(warmup):
+        optimise(index)
+    gc.collect()
+    tracemalloc.start()
+    start_heap, start_rss = tracemalloc.get_traced_memory()[0], rss_mb()
+    for index in range(warmup, warmup + runs):
+        optimise(index)
+    gc.collect()
+    end_heap, end_rss = tracemalloc.get_traced_memory()[0], rss_mb()
+    tracemalloc.stop()
+
+    return {
+        "runs": runs,
+        "heap_growth_mb": (end_heap - start_heap) / 2 ** 20,
+        "rss_growth_mb": None if start_rss is None else end_rss - start_rss,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check that repeated GUI optimisations do not grow memory.")
+    parser.add_argument("--runs", type=int, default=100, help="Optimisations measured after the warm-up")
+    parser.add_argument("--max-growth", type=float, default=None, help="Fail when the heap grows by more MB")
+    args = parser.parse_args(argv)
+
+    report = run_session(args.runs)
+    print(json.dumps(report, indent=2))
+    if args.max_growth is not None and report["heap_growth_mb"] > args.max_growth:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
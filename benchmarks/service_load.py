@@ -0,0 +1,115 @@
+"""Load test for the local optimisation service.
+
+Starts a service on a free localhost port (or targets --url) and fires requests from many
+client threads, with a share of them repeating a few popular specs so in-flight requests are
+merged:
+
+    python -m benchmarks.service_load --requests 200 --concurrency 16 --workers 4
+
+Reports throughput, client-side latency percentiles, the status code counts and the server's
+/metrics at the end.
+"""
+import argparse
+import json
+import random
+import sys
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+POPULAR = [  # Standard walls everyone asks for
+    {"width": 2540, "height": 2176, "drawers": 20, "short_hanging": 50, "seed": 1},
+    {"width": 1800, "height": 2176, "drawers": 30, "short_hanging": 30, "seed": 1},
+    {"width": 3200, "height": 2400, "drawers": 10, "short_hanging": 40, "long_hanging": 40, "seed": 1},
+]
+
+
+def make_specs(count, popular_share, population, generations, seed=0):
+    rng = random.Random(seed)
+    specs = []
+    for index in range(count):
+        if rng.random() < popular_share:
+            spec = dict(rng.choice(POPULAR))
+        else:
+            drawers = rng.randrange(0, 50)
+            spec = {"width": rng.randrange(1200, 5000, 10), "height": rng.randrange(1600, 2400, 32),
+                    "drawers": drawers, "short_hanging": rng.randrange(0, 100 - drawers), "seed": index}
+        specs.append(dict(spec, population=population, generations=generations))
+    return specs
+
+
+def post(url, spec, timeout):
+    """POST one spec, returning (status, seconds)"""
+    request = urllib.request.Request(f"{url}/optimise", json.dumps(spec).encode(), {"Content-Type": "application/json"})
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    return status, time.perf_counter() - start
+
+
+def run_load(url, specs, concurrency, timeout):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as executor:
+        results = list(executor.map(lambda spec: post(url, spec, timeout), specs))
+    elapsed = time.perf_counter() - start
+
+    latencies = np.array([seconds for status, seconds in results if status == 200])
+    with urllib.request.urlopen(f"{url}/metrics") as response:
+        metrics = json.load(response)
+    return {
+        "requests": len(specs),
+        "seconds": elapsed,
+        "throughput_per_second": len(specs) / elapsed,
+        "status": dict(Counter(status for status, _ in results)),
+        "latency_ms": {f"p{q}": float(np.percentile(latencies, q)) * 1000 if len(latencies) else None for q in (50, 90, 99)},
+        "server_metrics": metrics,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the local optimisation service.")
+    parser.add_argument("--url", default=None, help="Running service to target (default: start one)")
+    parser.add_argument("--requests", type=int, default=200, help="Requests to send")
+    parser.add_argument("--concurrency", type=int, default=16, help="Client threads")
+    parser.add_argument("--popular-share", type=float, default=0.5, help="Share of requests for a popular spec")
+    parser.add_argument("--population", type=int, default=100, help="Population per request")
+    parser.add_argument("--generations", type=int, default=20, help="Generations per request")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Seconds each request may wait")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Workers of the started service")
+    parser.add_argument("--max-queue", type=int, default=64, help="Queue bound of the started service")
+    args = parser.parse_args(argv)
+
+    specs = make_specs(args.requests, args.popular_share, args.population, args.generations)
+    for spec in specs:
+        spec["timeout"] = args.timeout
+
+    if args.url:
+        report = run_load(args.url.rstrip("/"), specs, args.concurrency, args.timeout + 5)
+    else:
+        import threading
+        from optimiser.service import OptimisationService, make_server
+
+        service = OptimisationService(args.workers, args.max_queue, args.timeout).start()  # No result store
+        server = make_server(service, port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            report = run_load(f"http://127.0.0.1:{server.server_address[1]}", specs, args.concurrency, args.timeout + 5)
+        finally:
+            server.shutdown()
+            server.server_close()
+            service.close()
+
+    print(json.dumps(report, indent=2))
+    return 0 if set(report["status"]) <= {200, 503} else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
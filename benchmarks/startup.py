@@ -0,0 +1,79 @@
+"""Cold start timing for the GUI and the headless optimiser.
+
+Each measurement runs in a fresh interpreter so nothing is already imported:
+
+    python -m benchmarks.startup
+    python -m benchmarks.startup --max-import 0.5
+
+Reports the import time of gui and optimiser.optimiser_core, which heavy modules they pulled in,
+and (when a display is available) the time until the main window has been drawn. Exits with
+status 1 when an import is slower than --max-import seconds or loads a module meant to be lazy.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LAZY_MODULES = ["deap", "matplotlib", "matplotlib.pyplot", "matplotlib.backends.backend_tkagg"]
+
+IMPORT_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {lazy!r} if m in sys.modules]}}))
+"""
+
+WINDOW_PROBE = """
+import json, time
+start = time.perf_counter()
+import customtkinter as ctk
+from gui import ClosetOptimiserGUI
+root = ctk.CTk()
+ClosetOptimiserGUI(root)
+root.update()
+elapsed = time.perf_counter() - start
+root.destroy()
+print(json.dumps({"seconds": elapsed}))
+"""
+
+
+def probe(code):
+    """Run code in a fresh interpreter from the repo root and parse its JSON output"""
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        return {"error": result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "failed"}
+    return json.loads(result.stdout)
+
+
+def measure():
+    report = {
+        module: probe(IMPORT_PROBE.format(module=module, lazy=LAZY_MODULES))
+        for module in ("gui", "optimiser.optimiser_core")
+    }
+    report["window_ready"] = probe(WINDOW_PROBE)  # Needs a display, reported as an error without one
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure cold start import and window-ready time.")
+    parser.add_argument("--max-import", type=float, default=None, help="Fail if an import takes longer (seconds)")
+    args = parser.parse_args(argv)
+
+    report = measure()
+    print(json.dumps(report, indent=2))
+
+    failed = False
+    for module in ("gui", "optimiser.optimiser_core"):
+        result = report[module]
+        if "error" in result or result["loaded"]:
+            failed = True
+        elif args.max_import is not None and result["seconds"] > args.max_import:
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
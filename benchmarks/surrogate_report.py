@@ -0,0 +1,79 @@
+"""Accuracy versus latency of the layout surrogate against the full GA.
+
+Draws random held-out specs (widths within the trained column counts, heights and preference
+splits off the training grid) and solves each with the surrogate and with the GA:
+
+    python -m benchmarks.surrogate_report surrogate.npz --specs 50
+
+Reports median and p95 latency of both, the mean fitness gap to the GA and the share of specs
+where the surrogate is within --tolerance of the GA's fitness.
+"""
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from optimiser.optimiser_core import ClosetOptimiser
+from optimiser.surrogate import COMPONENTS, DEFAULT_MODEL_PATH, SurrogateModel
+
+GA_ALG_PREF = {"Population": 500, "Generations": 100}
+
+
+def held_out_specs(model, count, seed=0):
+    """Random specs whose width maps onto a column count the model was trained for"""
+    rng = np.random.default_rng(seed)
+    specs = []
+    while len(specs) < count:
+        width = int(rng.integers(600, 6000))
+        height = int(rng.integers(50, 76)) * 32  # 1600 to 2400 mm
+        split = rng.multinomial(100, rng.dirichlet(np.ones(len(COMPONENTS))))
+        optimiser = ClosetOptimiser(width, height, dict(zip(COMPONENTS, split.tolist())), GA_ALG_PREF)
+        if optimiser.columns in model.features and optimiser.preferences:
+            specs.append(optimiser)
+    return specs
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+def measure(model, count, tolerance, seed=0):
+    rows = []
+    for index, optimiser in enumerate(held_out_specs(model, count, seed)):
+        (surrogate, _), surrogate_time = timed(lambda: optimiser.optimise(engine="surrogate", surrogate=model, plot=False))
+        (ga, _), ga_time = timed(lambda: optimiser.optimise(seed=index, plot=False))
+        rows.append((surrogate.fitness.values[0], surrogate_time, ga.fitness.values[0], ga_time))
+
+    surrogate_fitness, surrogate_time, ga_fitness, ga_time = map(np.array, zip(*rows))
+    gap = ga_fitness - surrogate_fitness
+    return {
+        "specs": len(rows),
+        "surrogate_latency_ms": {"median": 1000 * np.median(surrogate_time), "p95": 1000 * np.percentile(surrogate_time, 95)},
+        "ga_latency_ms": {"median": 1000 * np.median(ga_time), "p95": 1000 * np.percentile(ga_time, 95)},
+        "mean_surrogate_fitness": surrogate_fitness.mean(),
+        "mean_ga_fitness": ga_fitness.mean(),
+        "mean_gap_to_ga": gap.mean(),
+        "within_tolerance": float((gap <= tolerance).mean()),
+        "better_than_ga": float((gap < 0).mean()),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the layout surrogate with the full GA.")
+    parser.add_argument("model", nargs="?", default=DEFAULT_MODEL_PATH, help="Model file from optimiser.surrogate train")
+    parser.add_argument("--specs", type=int, default=50, help="Number of held-out specs")
+    parser.add_argument("--tolerance", type=float, default=5.0, help="Fitness gap counted as a match")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the held-out specs")
+    args = parser.parse_args(argv)
+
+    report = measure(SurrogateModel.load(args.model), args.specs, args.tolerance, args.seed)
+    print(json.dumps(report, indent=2, default=float))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,12 @@
+import queue
+import threading
+
 import customtkinter as ctk
-from optimiser.optimiser_core import ClosetOptimiser
-from optimiser.visualiser import visualise_closet
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+
+# The optimiser, DEAP, matplotlib and the TkAgg backend are imported when first needed so the
+# window appears without waiting for them
+
+GUI_SEED = 0  # Fixed seed, so a query the store has seen run cold is answered from disk
 
 class ClosetOptimiserGUI:
     def __init__(self, root):
@@ -34,6 +39,14 @@ class ClosetOptimiserGUI:
         ctk.CTkLabel(self.options_frame, text="Options Panel", font=("Arial", 16)).pack(pady=5)
         ctk.CTkLabel(self.figures_frame, text="Figures Panel", font=("Arial", 16)).pack(pady=5)
 
+        # Background optimisation state, progress is passed from the worker thread through the queue
+        self.progress_queue = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.worker = None
+        self.live_figures = None  # Built on the first run, then only their artists are updated
+        self.store = None  # Result store, checked for the cold seeded run of each query
+        self.pareto = None  # (optimiser, ParetoFront) of the last finished nsga2 run
+
         # Add UI elements to the options frame
         self.add_options_ui()
 
@@ -65,6 +78,17 @@ class ClosetOptimiserGUI:
         self.short_hanging = create_slider_with_input(self.options_frame, "Short Hanging (%)", 0, 100, 1, 0)
         self.long_hanging = create_slider_with_input(self.options_frame, "Long Hanging (%)", 0, 100, 1, 0)
 
+        # Space utilisation against matching the preferences, picked from the last nsga2 run's Pareto front
+        trade_off_frame = ctk.CTkFrame(self.options_frame)
+        trade_off_frame.pack(pady=5, fill="x")
+        ctk.CTkLabel(trade_off_frame, text="Utilisation Weight").pack(side="left", padx=5)
+        self.utilisation_weight = ctk.DoubleVar(value=1.0)
+        ctk.CTkSlider(
+            trade_off_frame, from_=0, to=3, number_of_steps=30, variable=self.utilisation_weight, command=self.pick_trade_off
+        ).pack(side="left", expand=True, fill="x", padx=5)
+        self.trade_off_label = ctk.CTkLabel(trade_off_frame, text="", width=160)
+        self.trade_off_label.pack(side="left", padx=5)
+
         # Advanced settings button
         toggle_button = ctk.CTkButton(self.options_frame, text="Show Advanced Settings", command=self.toggle_advanced)
         toggle_button.pack(pady=10)
@@ -74,8 +98,25 @@ class ClosetOptimiserGUI:
         self.pop_size = create_slider_with_input(self.advanced_frame, "Algorithm Population Size", 100, 5000, 100, 500)
         self.num_gens = create_slider_with_input(self.advanced_frame, "Algorithm Generations", 100, 1000, 100, 100)
 
-        # Optimise button
-        ctk.CTkButton(self.options_frame, text="Optimise Closet", command=self.run_optimisation).pack(pady=10)
+        # Let the GA adapt its mutation rate and selection pressure as it runs (GA engines only), off by
+        # default until it has won benchmarks/adaptive_report over more specs
+        self.adaptive = ctk.BooleanVar(value=False)
+        ctk.CTkSwitch(self.advanced_frame, text="Adaptive Operators", variable=self.adaptive).pack(pady=5, anchor="w", padx=5)
+
+        # Search engine, the exact solver falls back to the GA when the lattice is too large and the
+        # heuristic engine returns the greedy layout straight away
+        engine_frame = ctk.CTkFrame(self.advanced_frame)
+        engine_frame.pack(pady=5, fill="x")
+        ctk.CTkLabel(engine_frame, text="Search Engine").pack(side="left", padx=5)
+        self.engine = ctk.StringVar(value="ga")
+        engines = ["ga", "exact", "heuristic", "decompose", "surrogate", "nsga2"]
+        ctk.CTkSegmentedButton(engine_frame, values=engines, variable=self.engine).pack(side="left", padx=5)
+
+        # Optimise and cancel buttons
+        self.optimise_button = ctk.CTkButton(self.options_frame, text="Optimise Closet", command=self.run_optimisation)
+        self.optimise_button.pack(pady=10)
+        self.cancel_button = ctk.CTkButton(self.options_frame, text="Cancel", command=self.cancel_optimisation, state="disabled")
+        self.cancel_button.pack(pady=5)
 
     def toggle_advanced(self):
         """Toggle the visibility of the advanced section."""
@@ -85,7 +126,11 @@ class ClosetOptimiserGUI:
             self.advanced_frame.pack(fill="x", pady=10)
 
     def run_optimisation(self):
-        """Run the optimisation and update the figures."""
+        """Start the optimisation in the background and show live figures."""
+        from optimiser.optimiser_core import ClosetOptimiser
+        from optimiser.store import ResultStore
+        from optimiser.visualiser import LiveFigures
+
         # Collect user inputs
         width = self.width.get()
         height = self.height.get()
@@ -104,18 +149,112 @@ class ClosetOptimiserGUI:
         if preferences["shelves"] < 0:
             raise ValueError("Percentages must be less than or equal to 100")
 
-        # Run optimisation
+        # Build the optimiser and clear the live figures on the Tk thread, then search in the background
         optimiser = ClosetOptimiser(int(width), int(height), preferences, alg_pref)
-        best_individual, progress_fig = optimiser.optimise()
+        if self.store is None:
+            self.store = ResultStore()
+        if self.live_figures is None:
+            self.live_figures = LiveFigures()
+            self.update_figure(self.live_figures.figures, ["Closet Visualisation", "Optimisation Progress"])
+        self.live_figures.reset(width, height, optimiser.columns)
+        preview = optimiser.map_individual_to_arrangement(optimiser.heuristic_genome())  # Instant greedy layout
+        self.live_figures.closet.render(preview, width, height, optimiser.columns)
+        self.live_figures.draw_idle()
+        self.history = {"gen": [], "max": [], "avg": []}
+        self.pareto = None
+        self.trade_off_label.configure(text="")
+
+        self.cancel_event.clear()
+        self.optimise_button.configure(state="disabled")
+        self.cancel_button.configure(state="normal")
+        self.worker = threading.Thread(
+            target=self.optimise_in_background, args=(optimiser, self.engine.get(), self.adaptive.get()), daemon=True
+        )
+        self.worker.start()
+        self.root.after(100, self.poll_progress, optimiser)
+
+    def optimise_in_background(self, optimiser, engine, adaptive=False):
+        """Worker thread body: run the search (or fetch a stored result), reporting each generation through the queue."""
+        def report(gen, record, best_individual):
+            self.progress_queue.put(("progress", gen, record, list(best_individual)))
+            return self.cancel_event.is_set()
 
-        # Prepare output for visualisation
+        from optimiser.optimiser_core import ADAPTIVE_ENGINES
+
+        # The switch only applies to the GA engines, nsga2 keeps its own fixed operators
+        options = {"engine": engine, "seed": GUI_SEED, "plot": False, "adaptive": adaptive and engine in ADAPTIVE_ENGINES}
+        try:
+            # A stored cold run of the same query answers straight away, otherwise warm start from the last run
+            stored = self.store.load(optimiser, **options)
+            if stored is not None:
+                best_individual = stored[0]
+            else:
+                best_individual, _, _ = self.store.optimise(optimiser, callback=report, warm_start=True, **options)
+        except Exception as e:
+            self.progress_queue.put(("error", e))
+        else:
+            self.progress_queue.put(("done", list(best_individual)))
+
+    def cancel_optimisation(self):
+        """Ask the running optimisation to stop, it returns the best individual found so far."""
+        self.cancel_event.set()
+        self.cancel_button.configure(state="disabled")
+
+    def poll_progress(self, optimiser):
+        """Drain the progress queue on the Tk thread and redraw the live figures."""
+        latest, finished = None, None
+        while True:
+            try:
+                message = self.progress_queue.get_nowait()
+            except queue.Empty:
+                break
+            if message[0] == "progress":
+                _, gen, record, latest = message
+                for key in self.history:
+                    self.history[key].append(gen if key == "gen" else record[key])
+            else:
+                finished = message
+
+        if finished is not None and finished[0] == "done":
+            latest = finished[1]
+            self.history = {key: optimiser.logbook.select(key) for key in self.history}
+            if optimiser.pareto_front is not None:
+                self.pareto = (optimiser, optimiser.pareto_front)
+                self.pick_trade_off(self.utilisation_weight.get())
+                latest = None
+        if latest is not None:
+            self.draw_progress(optimiser, latest)
+
+        if finished is None:
+            self.root.after(100, self.poll_progress, optimiser)
+            return
+
+        self.optimise_button.configure(state="normal")
+        self.cancel_button.configure(state="disabled")
+        if finished[0] == "error":
+            raise finished[1]
+
+    def draw_progress(self, optimiser, best_individual):
+        """Update the closet layout and the fitness curve in place."""
         arrangement = optimiser.map_individual_to_arrangement(best_individual)
-        closet_fig = visualise_closet(arrangement, width, height, optimiser.columns)
+        self.live_figures.show(arrangement, optimiser.width, optimiser.height, optimiser.columns,
+                               self.history["gen"], self.history["max"], self.history["avg"])
+        self.live_figures.draw_idle()
 
-        self.update_figure([closet_fig, progress_fig], ["Closet Visualisation", "Optimisation Progress"])
+    def pick_trade_off(self, weight):
+        """Redraw the closet with the Pareto front layout for a utilisation weight, without re-running."""
+        if self.pareto is None:
+            return
+        optimiser, front = self.pareto
+        index = front.pick(float(weight))
+        deviation, unused = front.points[index]
+        self.trade_off_label.configure(text=f"{deviation:.1f}% off, {unused * 50:.0f} mm unused")  # Unused term is mm / 50
+        self.draw_progress(optimiser, front.genomes[index].tolist())
 
     def update_figure(self, figures, titles):
-        """Display the figures in tabs within the right panel."""
+        """Display the figures in tabs within the right panel, called once as the canvases are kept between runs."""
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+
         # Clear existing content
         for widget in self.figures_frame.winfo_children():
             widget.destroy()
@@ -141,6 +280,7 @@ class ClosetOptimiserGUI:
             # Pack the canvas
             canvas.get_tk_widget().pack(fill="both", expand=True)
 
+
 # Example usage
 if __name__ == "__main__":
     app = ctk.CTk()
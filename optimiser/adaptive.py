@@ -0,0 +1,98 @@
+"""Self-adaptive operator settings for the GA.
+
+    best, fig = optimiser.optimise(adaptive=True)
+
+An AdaptiveController sets mutpb and the tournament size of every generation from whether the
+best fitness is still improving and the population's diversity, and draws a crossover operator
+for each pair by probability matching on how often each operator recently produced a child
+better than both its parents. Pass your own controller to keep its per-generation history.
+"""
+import numpy as np
+
+CROSSOVERS = ("two_point", "uniform", "column")  # Operators of ClosetOptimiser.vary_units, by index
+
+
+class AdaptiveController:
+    """Per-generation cxpb, mutpb, tournament size and crossover operator shares for one GA run.
+
+    While the best fitness improves, mutation decays towards min_mutpb and the tournament grows
+    towards max_tournsize, so the run converges on the new best with few fresh evaluations. After
+    `stall` generations without improvement, or once the mean normalised spread of the genes drops
+    below low_diversity, both go back to their starting values. cxpb stays where it started:
+    raising it when exploiting cost evaluations on every benchmark spec.
+    """
+
+    def __init__(self, cxpb=0.5, mutpb=0.2, tournsize=3, min_mutpb=0.05, max_tournsize=6, low_diversity=0.03, stall=3,
+                 decay=0.3, min_share=0.1):
+        self.initial = {"cxpb": cxpb, "mutpb": mutpb, "tournsize": tournsize}
+        self.min_mutpb, self.max_tournsize = min_mutpb, max_tournsize
+        self.low_diversity = low_diversity  # Mean gene standard deviation over its range counted as converged
+        self.stall = stall  # Generations without improvement before going back to the starting settings
+        self.decay = decay  # Weight of the latest generation in each operator's success rate
+        self.min_share = min_share  # Every operator keeps at least this share of the pairs
+        self.reset()
+
+    def reset(self):
+        self.cxpb, self.mutpb, self.tournsize = self.initial["cxpb"], self.initial["mutpb"], self.initial["tournsize"]
+        self.quality = np.full(len(CROSSOVERS), 0.5)  # Recency weighted success rate of each crossover operator
+        self.parent_fits = None  # Fitness of the population the next offspring are bred from
+        self.best = -np.inf
+        self.stale = 0
+        self.history = []
+
+    def shares(self):
+        """Probability matching: every operator gets min_share, the rest in proportion to its success rate"""
+        free = 1 - len(CROSSOVERS) * self.min_share
+        return self.min_share + free * self.quality / self.quality.sum() if self.quality.sum() > 0 else np.full(len(CROSSOVERS), 1 / len(CROSSOVERS))
+
+    def settings(self, num_pairs, rng):
+        """cxpb, mutpb, tournsize and a crossover operator index per pair for the next generation"""
+        return self.cxpb, self.mutpb, self.tournsize, rng.choice(len(CROSSOVERS), size=num_pairs, p=self.shares())
+
+    def credit(self, fits, crossed, operators):
+        """Score each crossover operator by how often its pairs produced a child better than both parents"""
+        if self.parent_fits is None:
+            return  # The initial population is never evaluated
+        num_pairs = len(crossed)
+        pair_improved = (np.maximum(fits[0:2 * num_pairs:2], fits[1:2 * num_pairs:2])
+                         > np.maximum(self.parent_fits[0:2 * num_pairs:2], self.parent_fits[1:2 * num_pairs:2]))
+        for index in range(len(CROSSOVERS)):
+            used = crossed & (operators == index)
+            if used.any():
+                self.quality[index] += self.decay * (pair_improved[used].mean() - self.quality[index])
+
+    def adapt(self, population, population_fits, gene_max_units):
+        """Set mutation and selection pressure for the next generation from the selected population"""
+        diversity = float((population.std(axis=0) / np.maximum(gene_max_units, 1)).mean())
+        best = float(population_fits.max())
+        improved = best > self.best
+        self.stale = 0 if improved else self.stale + 1
+        self.best = max(self.best, best)
+        if self.stale >= self.stall or diversity < self.low_diversity:
+            # Stalled or converged: back to the starting mutation rate and selection pressure
+            self.mutpb, self.tournsize = self.initial["mutpb"], self.initial["tournsize"]
+            self.stale = 0  # One reset per stall, then give it time to pay off
+        elif improved:
+            # Still improving: mutate less and select harder to converge on the new best
+            self.mutpb = max(self.mutpb * 0.9, self.min_mutpb)
+            self.tournsize = min(self.tournsize + 1, self.max_tournsize)
+        self.parent_fits = population_fits.copy()
+        self.history.append({"cxpb": self.cxpb, "mutpb": self.mutpb, "tournsize": self.tournsize,
+                             "diversity": diversity, "shares": self.shares().tolist()})
+
+    def __repr__(self):
+        """Settings only, so result store keys do not depend on the instance"""
+        options = dict(self.initial, min_mutpb=self.min_mutpb, max_tournsize=self.max_tournsize,
+                       low_diversity=self.low_diversity, stall=self.stall, decay=self.decay, min_share=self.min_share)
+        return f"AdaptiveController({', '.join(f'{name}={value!r}' for name, value in options.items())})"
+
+
+def resolve_controller(adaptive, cxpb, mutpb):
+    """optimise()'s adaptive argument: True for a new controller starting from cxpb and mutpb, a controller as is
+    (reset for the run), otherwise None"""
+    if adaptive is True:
+        return AdaptiveController(cxpb, mutpb)
+    if adaptive:
+        adaptive.reset()
+        return adaptive
+    return None
@@ -0,0 +1,207 @@
+"""Headless batch optimisation of many closet specs.
+
+Reads specs from CSV or JSONL and writes one JSON result line per spec as soon as it finishes:
+
+    python -m optimiser.batch specs.csv --workers 8 > results.jsonl
+
+Each spec has width and height (mm) and the drawers, short_hanging and long_hanging percentages;
+shelves takes the remainder as in the GUI unless given. population, generations, seed, engine and
+id are optional per spec. With --thumbnails DIR each design is also rendered to DIR/<id>.png (or
+.svg) through the cached Agg renderer. Results are looked up in and saved to the result store
+(optimiser.store) unless --no-store is given. This module never imports tkinter or pyplot.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+os.environ.setdefault("MPLBACKEND", "Agg")  # Never let matplotlib pick an interactive backend
+
+DEFAULT_POPULATION = 500
+DEFAULT_GENERATIONS = 100
+
+
+class _ReadError:
+    """Stands in for a JSONL line that could not be read, so spec fields (even one called error) are never mistaken for it"""
+
+    def __init__(self, id, error):
+        self.id = id
+        self.error = error
+
+
+def read_specs(path):
+    """Yield spec dicts from a .csv or .jsonl file, '-' reads JSONL from stdin. A malformed JSONL line is
+    yielded as a _ReadError so one bad line does not stop the batch"""
+    if path == "-":
+        lines = sys.stdin
+    elif path.endswith(".csv"):
+        with open(path, newline="") as f:
+            for line_number, row in enumerate(csv.DictReader(f), start=1):
+                yield dict(row, id=row.get("id") or str(line_number))
+        return
+    else:
+        lines = open(path)
+
+    with lines:
+        for line_number, line in enumerate(lines, start=1):
+            if line.strip():
+                try:
+                    spec = json.loads(line)
+                    if not isinstance(spec, dict):
+                        raise ValueError(f"expected a JSON object, got {type(spec).__name__}")
+                except ValueError as e:  # JSONDecodeError is a ValueError
+                    yield _ReadError(str(line_number), f"{type(e).__name__}: {e}")
+                    continue
+                spec.setdefault("id", str(line_number))
+                yield spec
+
+
+def parse_spec(spec, defaults):
+    """Turn a raw CSV/JSONL row into optimiser arguments"""
+    # Same component order as the GUI, shelves take the remainder unless given
+    def percentage(component):
+        value = spec.get(component)
+        return 0 if value in (None, "") else int(float(value))
+
+    preferences = {"shelves": 0, "drawers": percentage("drawers"), "short_hanging": percentage("short_hanging"),
+                   "long_hanging": percentage("long_hanging")}
+    shelves = spec.get("shelves")
+    preferences["shelves"] = percentage("shelves") if shelves not in (None, "") else 100 - sum(preferences.values())
+    if preferences["shelves"] < 0:
+        raise ValueError("Percentages must be less than or equal to 100")
+
+    def option(key):
+        value = spec.get(key)
+        return defaults[key] if value in (None, "") else value
+
+    return {
+        "id": str(spec["id"]),
+        "width": int(float(spec["width"])),
+        "height": int(float(spec["height"])),
+        "preferences": preferences,
+        "alg_pref": {"Population": int(option("population")), "Generations": int(option("generations"))},
+        "seed": None if option("seed") is None else int(option("seed")),
+        "engine": option("engine"),
+    }
+
+
+def run_spec(job):
+    """Optimise one parsed spec, returning a JSON-serialisable result"""
+    from optimiser.optimiser_core import ClosetOptimiser
+
+    start = time.perf_counter()
+    optimiser = ClosetOptimiser(job["width"], job["height"], job["preferences"], job["alg_pref"])
+    cached = False
+    if job.get("store"):
+        from optimiser.store import ResultStore
+
+        best_individual, _, cached = ResultStore(job["store"]).optimise(optimiser, seed=job["seed"], engine=job["engine"],
+                                                                       plot=False, profile=job.get("profile"))
+    else:
+        best_individual, _ = optimiser.optimise(seed=job["seed"], engine=job["engine"], plot=False, profile=job.get("profile"))
+    arrangement = optimiser.map_individual_to_arrangement(best_individual)
+
+    result = {
+        "id": job["id"],
+        "width": job["width"],
+        "height": job["height"],
+        "preferences": job["preferences"],
+        "fitness": best_individual.fitness.values[0],
+        "best_individual": list(best_individual),
+        "arrangement": [
+            {"column": column, "component": component, "height": height}
+            for (column, component), height in arrangement.items()
+        ],
+        "stop_reason": optimiser.logbook.stop_reason,
+        "cached": cached,
+        "seconds": round(time.perf_counter() - start, 4),
+    }
+    if optimiser.pareto_front is not None:
+        result["pareto_front"] = optimiser.pareto_front.to_payload()
+    if job.get("profile") and optimiser.profile is not None:
+        result["profile"] = {key: value for key, value in optimiser.profile.items() if key != "generations"}
+    if job.get("thumbnails"):
+        from optimiser.visualiser import render_closet
+
+        path = os.path.join(job["thumbnails"], f"{job['id']}.{job['thumbnail_format']}")
+        render_closet(arrangement, job["width"], job["height"], optimiser.columns, path, job["thumbnail_format"])
+        result["thumbnail"] = path
+    return result
+
+
+def run_batch(specs, output, workers=None, defaults=None, thumbnails=None, thumbnail_format="png", store=None,
+              profile=False):
+    """Fan specs out over a process pool and stream one JSON line per spec as it finishes"""
+    if thumbnails:
+        os.makedirs(thumbnails, exist_ok=True)
+    defaults = defaults or {"population": DEFAULT_POPULATION, "generations": DEFAULT_GENERATIONS, "seed": None, "engine": "ga"}
+    failures = 0
+
+    def write(result):
+        output.write(json.dumps(result) + "\n")
+        output.flush()
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {}
+        for spec in specs:
+            if isinstance(spec, _ReadError):
+                failures += 1
+                write({"id": spec.id, "error": spec.error})
+                continue
+            try:
+                job = parse_spec(spec, defaults)
+            except (KeyError, TypeError, ValueError) as e:
+                failures += 1
+                write({"id": str(spec.get("id")), "error": f"{type(e).__name__}: {e}"})
+                continue
+            job.update(thumbnails=thumbnails, thumbnail_format=thumbnail_format, store=store, profile=profile)
+            futures[executor.submit(run_spec, job)] = job["id"]
+
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                failures += 1
+                result = {"id": futures[future], "error": f"{type(e).__name__}: {e}"}
+            write(result)
+
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Optimise closet specs from a CSV or JSONL file without the GUI.")
+    parser.add_argument("specs", help="CSV or JSONL spec file, '-' for JSONL on stdin")
+    parser.add_argument("-o", "--output", help="Write results to this JSONL file instead of stdout")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--population", type=int, default=DEFAULT_POPULATION, help="Default population size")
+    parser.add_argument("--generations", type=int, default=DEFAULT_GENERATIONS, help="Default generation count")
+    parser.add_argument("--seed", type=int, default=None, help="Default seed for reproducible runs")
+    parser.add_argument("--engine", choices=["ga", "exact", "heuristic", "decompose", "surrogate", "nsga2"], default="ga", help="Default search engine")
+    parser.add_argument("--thumbnails", metavar="DIR", help="Also render each design to DIR/<id>.<format>")
+    parser.add_argument("--thumbnail-format", choices=["png", "svg"], default="png", help="Thumbnail image format")
+    parser.add_argument("--store", default=None, help="Result store to check first and fill (default: the shared store)")
+    parser.add_argument("--no-store", action="store_true", help="Always optimise, never read or write the result store")
+    parser.add_argument("--profile", action="store_true", help="Add per-phase timings and counts to each result")
+    args = parser.parse_args(argv)
+
+    defaults = {"population": args.population, "generations": args.generations, "seed": args.seed, "engine": args.engine}
+    store = None
+    if not args.no_store:
+        from optimiser.store import DEFAULT_PATH, ResultStore
+
+        store = ResultStore(args.store or DEFAULT_PATH).path  # Create the database once, workers open their own connections
+    output = open(args.output, "w") if args.output else sys.stdout
+    try:
+        failures = run_batch(read_specs(args.specs), output, args.workers, defaults, args.thumbnails, args.thumbnail_format,
+                             store, args.profile)
+    finally:
+        if args.output:
+            output.close()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
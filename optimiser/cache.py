@@ -0,0 +1,55 @@
+from collections import OrderedDict
+
+
+class FitnessCache:
+    """Bounded LRU cache of fitness values keyed on the genome as an immutable tuple or packed bytes.
+
+    Selection and crossover produce many exact copies of parents, and mutation draws from a
+    small set of multiples, so the same genomes come back generation after generation.
+    """
+    def __init__(self, maxsize=65536):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        """Drop every entry and reset the counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def evaluate(self, individuals, score, key=tuple):
+        """Return the fitness of each individual, calling score only for genomes not seen before.
+
+        score receives a list of unseen individuals (each distinct genome once) and returns
+        their fitness values in the same order. key turns an individual into a hashable genome key,
+        such as a tuple or the packed bytes of an array row.
+        """
+        keys = [key(individual) for individual in individuals]
+        unseen = {}
+        for individual, genome_key in zip(individuals, keys):
+            if genome_key not in self._entries and genome_key not in unseen:
+                unseen[genome_key] = individual
+        self.misses += len(unseen)
+        self.hits += len(keys) - len(unseen)
+
+        scored = dict(zip(unseen, score(list(unseen.values())))) if unseen else {}
+        fits = []
+        for genome_key in keys:
+            if genome_key in scored:
+                fits.append(scored[genome_key])
+            else:
+                fits.append(self._entries[genome_key])
+                self._entries.move_to_end(genome_key)
+
+        # Store new entries last so evictions never drop a value this batch still needs
+        for genome_key, fit in scored.items():
+            self._entries[genome_key] = fit
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+        return fits
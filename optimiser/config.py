@@ -1,4 +1,16 @@
 WIDTH = 100
 HEIGHT = 96
 COLUMNS = 4
-COMPONENTS = ["drawers", "shelves", "short_hanging", "long_hanging"]
\ No newline at end of file
+COMPONENTS = ["drawers", "shelves", "short_hanging", "long_hanging"]
+
+# Minimum height of each component (mm), every component height is a multiple of it
+MIN_HEIGHTS = {
+    "shelves": 32,
+    "drawers": (7*32), # 224 mm
+    "short_hanging": (29*32), # 928 mm
+    "long_hanging": (47*32) # 1504 mm
+}
+
+# Allowed bay (column) width range (mm), the column count is the fewest bays no wider than MAX_BAY_WIDTH
+MIN_BAY_WIDTH = 300
+MAX_BAY_WIDTH = 650
@@ -0,0 +1,58 @@
+import heapq
+
+import numpy as np
+
+
+def split_budget(optimiser):
+    """Split each component's share of the wall into whole units per column, lumpiest components first.
+
+    Every unit goes to the column with the most free height left, so long hanging and other tall
+    components land in whole columns instead of being rounded away. Returns a (columns, K) array
+    of target heights in mm whose columns all fit the closet height.
+    """
+    columns, height = optimiser.columns, optimiser.height
+    steps = [optimiser.min_heights[component] for component in optimiser.components]
+    targets = np.zeros((columns, len(steps)), dtype=np.int64)
+    free = [(-height, col) for col in range(columns)]  # Max-heap of free height per column
+
+    for k in sorted(range(len(steps)), key=lambda k: -steps[k]):
+        units = round(optimiser.preferences[optimiser.components[k]] / 100 * columns * height / steps[k])
+        for _ in range(units):
+            space, col = free[0]
+            if -space < steps[k]:
+                break  # No column has room for another unit of this component
+            targets[col, k] += steps[k]
+            heapq.heapreplace(free, (space + steps[k], col))
+    return targets
+
+
+def solve_column(task):
+    """Worker entry point: best lattice heights for one column given its target heights.
+
+    Scores every combination of component heights in the column with the terms of evaluate
+    that belong to one column: the deviation from its targets as a share of the whole closet,
+    the unused space penalty and the column height limit.
+    """
+    targets, steps, height, capacity = task
+    grids = np.meshgrid(*[np.arange(height // step + 1) * step for step in steps], indexing="ij", sparse=True)
+    total = sum(grids)
+    deviation = sum(np.abs(grid - target) for grid, target in zip(grids, targets)) / capacity * 100
+    score = np.where(total <= height, -(deviation + (height - total) / 50), -np.inf)
+    best = np.unravel_index(np.argmax(score), np.shape(score))
+    return [int(index) * step for index, step in zip(best, steps)]
+
+
+def solve_decomposed(optimiser):
+    """Genome from splitting the preferences across columns and solving each column on its own.
+
+    The per-column solves are independent and run on the optimiser's pool when it has one, so
+    the work grows linearly with the number of columns (and so with the wall width).
+    """
+    steps = [optimiser.min_heights[component] for component in optimiser.components]
+    capacity = optimiser.columns * optimiser.height
+    tasks = [(targets.tolist(), steps, optimiser.height, capacity) for targets in split_budget(optimiser)]
+    if optimiser.pool is not None:
+        columns = optimiser.pool.map(solve_column, tasks)
+    else:
+        columns = list(map(solve_column, tasks))
+    return [height for column in columns for height in column]  # Column-major like the GA genome
@@ -0,0 +1,100 @@
+from optimiser.config import COLUMNS, MIN_HEIGHTS
+
+
+class ClosetDesigner:
+    """Deterministic greedy allocator: drawers spread over the middle columns, other components fill what is left.
+
+    Each column's occupancy is kept as a list of (bottom, top, component) intervals stacked from the
+    floor, so a design costs a few operations per component instead of a per-mm grid.
+    """
+
+    def __init__(self, width, height, columns=COLUMNS, min_heights=MIN_HEIGHTS):
+        self.width = width
+        self.height = height
+        self.columns = columns
+        self.column_width = width / columns
+        self.comp_size = dict(min_heights)  # Size of one unit of each component
+        self.occupancy = {col: [] for col in range(columns)}
+
+    def validate_percentages(self, percentages):
+        if any(percentage < 0 for percentage in percentages.values()) or sum(percentages.values()) <= 0:
+            raise ValueError("Percentages must be non-negative with a positive total.")
+
+    def allocate_space(self, percentages):
+        self.validate_percentages(percentages)
+        total = sum(percentages.values())  # 100 from the GUI, other totals are treated as shares
+        allocations = {}
+        for component, percentage in percentages.items():
+            allocations[component] = int((percentage / total) * self.height * self.columns)  # Maximum height for each component across all columns
+
+        return allocations
+
+    def free_height(self, col):
+        """Height left above the top interval of a column"""
+        intervals = self.occupancy[col]
+        return self.height - (intervals[-1][1] if intervals else 0)
+
+    def place(self, col, component, comp_height):
+        """Stack a block of a component on top of a column"""
+        bottom = self.height - self.free_height(col)
+        self.occupancy[col].append((bottom, bottom + comp_height, component))
+
+    def allocate_comps(self, allocations, comp_filter=None, col_range=None, even_dist=False):
+        # initialise variables
+        if col_range is None:
+            col_range = range(self.columns)
+        if comp_filter is None:
+            comp_filter = list(self.comp_finish)
+        comp_size = self.comp_size
+
+        # allocate components to remaining space
+        comp_dict = {k: v for k, v in allocations.items() if k in comp_filter}  # create dict with required components
+        for component, comp_height in comp_dict.items():
+            self.comp_finish.remove(component)  # set current component as finished
+            for col in col_range:
+                # check if component must be evenly distributed
+                if even_dist:
+                    comp_height = comp_dict[component] / len(col_range)  # ensure same height available for each suitable column
+                # if component not finished then allocate to column
+                allocation = comp_size[component] * (min(comp_height, self.free_height(col)) // comp_size[component])  # max number of full components that fit
+                if allocation > 0:
+                    self.place(col, component, int(allocation))
+                    comp_height -= allocation
+
+    def arrange_components(self, allocations):
+        middle_columns = ([0, 1] if self.columns == 2 else [i for i in range(1, self.columns - 1)] or [0])  # find middle columns, if no middle then default to column 0 or 0,1 for 1 and 2 columns respectively
+        self.occupancy = {col: [] for col in range(self.columns)}
+        self.comp_finish = list(allocations)
+
+        # Allocate drawers to middle columns
+        self.allocate_comps(allocations, ["drawers"], middle_columns, True)
+
+        # Allocate other components to remaining space
+        self.allocate_comps(allocations)
+
+        return self.arrangement()
+
+    def arrangement(self):
+        """Occupancy as the {(column, component): height} mapping used by the optimiser and visualiser"""
+        return {(col, component): top - bottom for col, intervals in self.occupancy.items()
+                for bottom, top, component in intervals}
+
+    def design_closet(self, percentages):
+        allocations = self.allocate_space(percentages)
+        return self.arrange_components(allocations)
+
+    def genome(self, percentages, components):
+        """Design a closet and lay it out as an optimiser genome (gene col * K + k is component k's height in col)"""
+        arrangement = self.design_closet(percentages)
+        return [arrangement.get((col, component), 0) for col in range(self.columns) for component in components]
+
+
+# Example Usage
+if __name__ == "__main__":
+    from optimiser.visualiser import render_closet
+
+    percentages = {"drawers": 30, "short_hanging": 50, "shelves": 20}
+    designer = ClosetDesigner(2540, 2176)
+    arrangement = designer.design_closet(percentages)
+    print(arrangement)
+    render_closet(arrangement, designer.width, designer.height, designer.columns, "closet_design.png")
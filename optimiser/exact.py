@@ -0,0 +1,103 @@
+import itertools
+
+import numpy as np
+
+MAX_WORK = 2e8  # Largest DP table work (cells x column choices) attempted before falling back to the GA
+
+
+def lattice_work(optimiser):
+    """Estimate the DP work for an optimiser's lattice, used to decide whether to solve exactly"""
+    max_counts = _max_counts(optimiser)
+    filler = int(np.argmin([optimiser.min_heights[component] for component in optimiser.components]))
+    coarse = [count for index, count in enumerate(max_counts) if index != filler]
+    choices = np.prod([count + 1 for count in coarse], dtype=float)
+    states = np.prod([optimiser.columns * count + 1 for count in coarse], dtype=float)
+    return optimiser.columns * states * choices + states * (optimiser.columns * max_counts[filler] + 1)
+
+
+def solve_exact(optimiser, max_work=MAX_WORK):
+    """Return the provably best genome on the component height lattice, or None to fall back to the GA.
+
+    The lattice is the one constrained_mutate draws from: gene col * K + k is a multiple of
+    component k's minimum height between 0 and the closet height. The preference and unused
+    space terms of evaluate only depend on each component's total over all columns, so the DP
+    fills one column at a time and carries the totals so far. Only the coarse components (all
+    but the one with the smallest step, the filler) are in the state. The filler can take any
+    multiple of its step up to the space each column has left, so every filler total up to the
+    sum of those steps is reachable and the DP only keeps the most filler steps for each coarse
+    state. Deviation and unused space are charged once the filler total is picked at the end.
+
+    Columns are never filled over the height: any layout with an overflowing column scores below
+    -100, so the non-overflowing optimum is the best layout whenever it scores at least -100.
+    Returns None otherwise, as it does for lattices over max_work.
+    """
+    if lattice_work(optimiser) > max_work:
+        return None
+
+    columns, height = optimiser.columns, optimiser.height
+    num_components = len(optimiser.components)
+    capacity = columns * height
+    steps = np.array([optimiser.min_heights[component] for component in optimiser.components], dtype=np.int64)
+    max_counts = _max_counts(optimiser)
+    filler = int(np.argmin(steps))
+    coarse = [index for index in range(num_components) if index != filler]
+
+    # Every way to fill one column with the coarse components, and the filler steps that still fit
+    choices = list(itertools.product(*[range(max_counts[index] + 1) for index in coarse]))
+    choices = np.array(choices, dtype=np.int64).reshape(len(choices), len(coarse))
+    coarse_heights = choices @ steps[coarse]
+    choices, coarse_heights = choices[coarse_heights <= height], coarse_heights[coarse_heights <= height]
+    free = (height - coarse_heights) // steps[filler]
+
+    shape = tuple(columns * max_counts[index] + 1 for index in coarse)
+    value = np.full(shape, -1, dtype=np.int64)  # Most filler steps that fit with these coarse totals, -1 unreachable
+    value[(0,) * len(coarse)] = 0
+    trace = []  # Per column: the choice that reached each coarse totals state
+
+    for column in range(columns):
+        reach = tuple(column * max_counts[index] + 1 for index in coarse)  # Totals reachable before this column
+        source = value[tuple(slice(0, size) for size in reach)]
+        new_value = np.full(shape, -1, dtype=np.int64)
+        choice = np.zeros(shape, dtype=np.int32)
+        for index, counts in enumerate(choices):
+            window = tuple(slice(count, count + size) for count, size in zip(counts, reach)) + (Ellipsis,)  # View even with no coarse axes
+            candidate = np.where(source >= 0, source + free[index], -1)
+            better = candidate > new_value[window]
+            new_value[window][better] = candidate[better]
+            choice[window][better] = index
+        value = new_value
+        trace.append(choice)
+
+    # Charge deviation and unused space for every coarse state and filler total (last axis) that fits
+    fill_counts = np.arange(columns * max_counts[filler] + 1)
+    grids = np.meshgrid(*[np.arange(size) for size in shape], fill_counts, indexing="ij", sparse=True)
+    totals = dict(zip(coarse + [filler], grids))
+    deviation, used = 0, 0
+    for index, component in enumerate(optimiser.components):
+        total = totals[index] * steps[index]
+        deviation = deviation + np.abs(total / capacity * 100 - optimiser.preferences[component])
+        used = used + total
+    unused_space = capacity - used
+    fitness = -deviation - np.where(unused_space < 0, 100, unused_space / 50)
+    fitness = np.where(grids[-1] <= value[..., np.newaxis], fitness, -np.inf)
+
+    best = np.unravel_index(np.argmax(fitness), fitness.shape)
+    if fitness[best] < -100:
+        return None  # An overflowing layout might do better, leave it to the GA
+
+    # Walk the trace backwards to recover the columns, then spread the filler over their free space
+    state, fill_left = np.array(best[:-1], dtype=np.int64), int(best[-1])
+    genome = [0] * (columns * num_components)
+    for column in reversed(range(columns)):
+        index = trace[column][tuple(state)]
+        fill = min(fill_left, int(free[index]))
+        fill_left -= fill
+        for gene, count in zip(coarse + [filler], list(choices[index]) + [fill]):
+            genome[column * num_components + gene] = int(count * steps[gene])
+        state -= choices[index]
+    return genome
+
+
+def _max_counts(optimiser):
+    """Most minimum height steps of each component that fit in one gene"""
+    return [optimiser.height // optimiser.min_heights[component] for component in optimiser.components]
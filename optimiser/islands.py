@@ -0,0 +1,178 @@
+import time
+from contextlib import nullcontext
+
+import numpy as np
+
+from optimiser.parallel import EvaluationPool
+from optimiser.profiling import resolve_profiler
+from optimiser.stats import make_sink, should_record
+
+TOPOLOGIES = ("ring", "random")
+
+
+def _run_epoch(task):
+    """Worker entry point: evolve one island for a number of generations on its own RNG stream."""
+    optimiser, island, generations, settings = task
+    rng = np.random.default_rng()
+    rng.bit_generator.state = island["rng_state"]
+    population = island["population"]
+    offspring = np.empty_like(population)
+
+    records = []
+    for _ in range(generations):
+        fits, population_fits = optimiser.evolve_generation(population, offspring, rng, **settings)
+        best_index = int(np.argmax(fits))
+        if fits[best_index] > island["best_fitness"]:
+            island["best_fitness"] = float(fits[best_index])
+            island["best_units"] = offspring[best_index].copy()
+        records.append((float(population_fits.max()), float(population_fits.mean())))
+
+    island.update(population=population, fits=population_fits, rng_state=rng.bit_generator.state)
+    return island, records
+
+
+def migrate(islands, migrants, topology, rng):
+    """Copy each island's best individuals over the worst individuals of its neighbour"""
+    num_islands = len(islands)
+    if topology == "ring":
+        targets = [(index + 1) % num_islands for index in range(num_islands)]
+    else:
+        targets = [(index + int(rng.integers(1, num_islands))) % num_islands for index in range(num_islands)]
+
+    # Take every emigrant before any island is overwritten, so migration is simultaneous
+    emigrants = []
+    for island in islands:
+        best = np.argsort(-island["fits"], kind="stable")[:migrants]
+        emigrants.append((island["population"][best].copy(), island["fits"][best].copy()))
+    for (units, fits), target in zip(emigrants, targets):
+        island = islands[target]
+        worst = np.argsort(island["fits"], kind="stable")[:len(units)]
+        island["population"][worst] = units
+        island["fits"][worst] = fits
+
+
+def optimise_islands(optimiser, population_size=None, generations=None, islands=4, migration_interval=10, migrants=2,
+                     topology="ring", processes=None, seed=None, cxpb=0.5, mutpb=0.2, indpb=None, repair=True,
+                     patience=None, target_fitness=None, time_budget=None, callback=None, plot=True, warm_start=False,
+                     stats_sink=None, stats_every=1, heuristic_seeds=1, profile=None):
+    """Evolve several sub-populations in parallel, exchanging their best individuals every migration_interval generations.
+
+    population_size is split evenly across the islands. Each island evolves in a worker process
+    with the optimiser's array operators and its own RNG stream, so a seeded run gives the same
+    result however many processes are used (processes=0 runs every island in this process). The
+    optimiser's pool is used when it has one. Stopping criteria are checked between epochs, and
+    the logbook records the best and mean fitness across all islands each generation. stats_sink
+    and stats_every work as in ClosetOptimiser.optimise. Profiling times the epochs ("evolve"),
+    migration and bookkeeping in this process, one profiler generation per epoch.
+    """
+    if topology not in TOPOLOGIES:
+        raise ValueError(f"Unknown topology '{topology}', expected one of {TOPOLOGIES}")
+    if seed is not None:
+        optimiser.rng.seed(seed)
+    if population_size is None:
+        population_size = int(optimiser.alg_pref["Population"])
+    if generations is None:
+        generations = int(optimiser.alg_pref["Generations"])
+    island_size = max(2, -(-population_size // islands))  # Ceiling division
+    settings = {"cxpb": cxpb, "mutpb": mutpb, "repair": repair}
+    if indpb is not None:
+        settings["indpb"] = indpb
+
+    # Independent RNG streams for the coordinator and every island
+    streams = np.random.SeedSequence(optimiser.rng.getrandbits(64)).spawn(islands + 1)
+    rng = np.random.default_rng(streams[0])
+    population = optimiser.initial_population(island_size * islands, warm_start, rng, heuristic_seeds)
+    island_states = [
+        {
+            "population": population[index * island_size:(index + 1) * island_size].copy(),
+            "fits": np.full(island_size, -np.inf),
+            "rng_state": np.random.default_rng(stream).bit_generator.state,
+            "best_units": population[index * island_size].copy(),
+            "best_fitness": -np.inf,
+        }
+        for index, stream in enumerate(streams[1:])
+    ]
+
+    logbook, owned_sink = make_sink(stats_sink, ["gen", "max", "avg"])
+    logbook.stop_reason = "generations"
+    profiler = resolve_profiler(profile, optimiser.profiler)
+    phase = profiler.phase if profiler is not None else (lambda name: nullcontext())
+
+    owned_pool = None
+    if processes == 0:
+        run_all = lambda tasks: list(map(_run_epoch, tasks))
+    else:
+        pool = optimiser.pool
+        if pool is None:
+            pool = owned_pool = EvaluationPool(processes or islands)
+        run_all = lambda tasks: pool.map(_run_epoch, tasks)
+
+    start_time = time.perf_counter()
+    best_fitness, stale_generations = -np.inf, 0
+    completed = 0
+    try:
+        while completed < generations:
+            epoch = min(migration_interval, generations - completed)
+            with phase("evolve"):
+                results = run_all([(optimiser, island, epoch, settings) for island in island_states])
+            island_states = [island for island, _ in results]
+
+            # Merge the islands' records
+            merged = [
+                {"max": max(best for best, _ in records), "avg": sum(avg for _, avg in records) / len(records)}
+                for records in zip(*(records for _, records in results))
+            ]
+            completed += epoch
+
+            previous_best = best_fitness
+            best_island = max(island_states, key=lambda island: island["best_fitness"])
+            best_fitness = best_island["best_fitness"]
+            stale_generations = 0 if best_fitness > previous_best else stale_generations + epoch
+            stop_reason = None
+            with phase("callback"):
+                cancelled = callback is not None and callback(
+                    completed - 1, merged[-1], optimiser.to_individual(best_island["best_units"], best_fitness)
+                )
+            if cancelled:
+                stop_reason = "cancelled"
+            elif target_fitness is not None and best_fitness >= target_fitness:
+                stop_reason = "target"
+            elif patience is not None and stale_generations >= patience:
+                stop_reason = "patience"
+            elif time_budget is not None and time.perf_counter() - start_time >= time_budget:
+                stop_reason = "time_budget"
+
+            last = stop_reason is not None or completed == generations
+            with phase("stats"):
+                for gen, record in enumerate(merged, start=completed - epoch):
+                    if should_record(gen, stats_every, last and gen == completed - 1):
+                        logbook.record(gen=gen, **record)
+            if profiler is not None:
+                profiler.count(offspring=island_size * islands * epoch)
+                profiler.end_generation(completed - 1)
+            if stop_reason is not None:
+                logbook.stop_reason = stop_reason
+                break
+
+            if completed < generations and islands > 1:
+                with phase("migrate"):
+                    migrate(island_states, migrants, topology, rng)
+    finally:
+        if owned_pool is not None:
+            owned_pool.close()
+        if owned_sink:
+            logbook.close()
+
+    optimiser.logbook = logbook
+    if warm_start:
+        optimiser.store_warm_population(
+            np.concatenate([island["population"] for island in island_states]),
+            np.concatenate([island["fits"] for island in island_states]),
+        )
+
+    best_island = max(island_states, key=lambda island: island["best_fitness"])
+    best_individual = optimiser.to_individual(best_island["best_units"], best_island["best_fitness"])
+    with phase("plot"):
+        fig = optimiser.plot_progress(logbook) if plot and hasattr(logbook, "select") else None
+    optimiser.store_profile(logbook, profiler)
+    return best_individual, fig
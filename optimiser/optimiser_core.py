@@ -1,54 +1,121 @@
-from deap import base, creator, tools, algorithms
-import matplotlib.pyplot as plt
+from collections import OrderedDict
+from contextlib import nullcontext
+from operator import attrgetter
+import numpy as np
 import random
+import threading
+import time
+
+from optimiser.adaptive import resolve_controller
+from optimiser.cache import FitnessCache
+from optimiser.config import MAX_BAY_WIDTH, MIN_BAY_WIDTH, MIN_HEIGHTS
+from optimiser.decompose import solve_decomposed
+from optimiser.designer import ClosetDesigner
+from optimiser.exact import solve_exact
+from optimiser.profiling import resolve_profiler
+from optimiser.stats import make_sink, should_record
+from optimiser.surrogate import default_model
+
+
+INDPB = 0.25  # Default per-gene mutation probability
+ENGINES = ("ga", "exact", "islands", "heuristic", "decompose", "surrogate", "nsga2")
+ADAPTIVE_ENGINES = ("ga", "exact", "heuristic", "decompose", "surrogate")  # Engines that run (or fall back to) the single population GA
+
+
+def _no_phase(name):
+    """Stand-in for PhaseProfiler.phase when a run is not profiled"""
+    return nullcontext()
+
+
+def make_individual_types(weights=(1.0,)):
+    """Build Fitness and Individual classes for one optimiser, instead of DEAP's global creator classes"""
+    from deap import base
+
+    fitness_class = type("FitnessMax", (base.Fitness,), {"weights": weights})
+
+    class Individual(list):
+        def __init__(self, iterable=()):
+            super().__init__(iterable)
+            self.fitness = fitness_class()
+
+    return fitness_class, Individual
+
+
+def columns_for_width(width, min_bay_width=MIN_BAY_WIDTH, max_bay_width=MAX_BAY_WIDTH):
+    """Fewest columns whose bays are no wider than max_bay_width, bays narrower than min_bay_width are refused"""
+    columns = max(1, -(-int(width) // max_bay_width))  # Ceiling division
+    if columns > 1 and width / columns < min_bay_width:
+        raise ValueError(f"No column count gives bays between {min_bay_width} and {max_bay_width} mm for {width} mm")
+    return columns
 
 
 class ClosetOptimiser:
-    def __init__(self, width, height, preferences, alg_pref):
+    warm_populations = OrderedDict()  # Last final population per genome layout, shared by every optimiser
+    warm_population_limit = 8  # Number of layouts kept for warm starts
+    warm_populations_lock = threading.Lock()  # Optimisers in different threads share the warm start store
+
+    def __init__(self, width, height, preferences, alg_pref, pool=None, cache_size=65536, columns=None):
         self.width = width
         self.height = height
         self.preferences = {k: v for k, v in preferences.items() if v > 0}  # Filter out zero-preference components
-        self.columns = 4
+        self.columns = columns or columns_for_width(width)  # Bays between MIN_BAY_WIDTH and MAX_BAY_WIDTH wide
         self.components = list(self.preferences.keys())  # Use filtered components
-        self.min_heights = {  # Minimum heights for components
-            "shelves": 32,
-            "drawers": (7*32), # 224 mm
-            "short_hanging": (29*32), # 928 mm
-            "long_hanging": (47*32) # 1504 mm
-        }
+        self.min_heights = dict(MIN_HEIGHTS)  # Minimum heights for components, shared with ClosetDesigner
+        # Compact genome layout: gene col * K + k holds a multiple of component k's minimum height
+        self.gene_steps = np.array([self.min_heights[component] for component in self.components] * self.columns, dtype=np.int64)
+        self.gene_max_units = self.height // self.gene_steps
+        self.gene_dtype = np.uint8 if self.gene_max_units.max(initial=0) <= np.iinfo(np.uint8).max else np.uint16
         self.alg_pref = alg_pref
+        self.rng = random.Random()  # Instance RNG so concurrent optimisers never share random state
+        self.pool = pool  # Optional EvaluationPool, may be shared with other optimisers
+        self.cache = FitnessCache(cache_size) if cache_size else None  # Fitness memo, None to always evaluate
+        self.profiler = None  # PhaseProfiler used by every run, see optimiser.profiling.profiling
+        self.profile = None  # Profile report of the last run
+        self.pareto_front = None  # optimiser.pareto.ParetoFront of the last nsga2 run
+        self.toolbox = self.setup_toolbox()
+
+    def __getstate__(self):
+        """Pickle only the closet definition, the toolbox and types are rebuilt, the pool holds processes and the
+        last run's results stay behind"""
+        state = self.__dict__.copy()
+        for name in ("toolbox", "FitnessMax", "Individual"):
+            del state[name]
+        state["pool"] = None
+        state["cache"] = None  # Workers only score genomes, the cache lives in the parent process
+        state["profiler"] = None
+        for name in ("logbook", "profile", "pareto_front"):
+            state[name] = None  # Results of the last run, a file sink keeps its handle
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
         self.toolbox = self.setup_toolbox()
     
     def setup_toolbox(self):
         """Define the DEAP toolbox"""
-        # Avoid overwriting exisiting class
-        try:
-            del creator.Individual
-            del creator.FitnessMax
-        except Exception as e:
-            pass
+        from deap import base, tools
 
-        creator.create("FitnessMax", base.Fitness, weights=(1.0,))
-        creator.create("Individual", list, fitness=creator.FitnessMax)
+        # Types and operators are owned by this instance, so optimisers can run side by side
+        self.FitnessMax, self.Individual = make_individual_types(weights=(1.0,))
 
         toolbox = base.Toolbox()
 
         def attr_height(component):
             min_height = self.min_heights[component]
-            return random.randint(0, int(self.height // min_height)) * min_height
+            return self.rng.randint(0, int(self.height // min_height)) * min_height
 
         toolbox.register(
             "individual",
-            lambda: creator.Individual(
-                [attr_height(component) for component in self.components for _ in range(self.columns)]
+            lambda: self.Individual(
+                [attr_height(component) for _ in range(self.columns) for component in self.components]
             )
         )
 
         toolbox.register("population", tools.initRepeat, list, toolbox.individual)
         toolbox.register("evaluate", self.evaluate)
-        toolbox.register("mate", tools.cxTwoPoint)
-        toolbox.register("mutate", self.constrained_mutate) # use new custom mutation func for minimum comp heights
-        toolbox.register("select", tools.selTournament, tournsize=3)
+        toolbox.register("mate", self.cx_two_point)
+        toolbox.register("mutate", self.constrained_mutate, indpb=INDPB) # use new custom mutation func for minimum comp heights
+        toolbox.register("select", self.select_tournament, tournsize=3)
 
         # Legacy traits
         # toolbox.register("attr_height", random.randint, 10, self.height)
@@ -57,28 +124,69 @@ class ClosetOptimiser:
 
         return toolbox
     
-    def constrained_mutate(self, individual):
+    def constrained_mutate(self, individual, indpb=INDPB):
+        """Redraw each gene with probability indpb as a multiple of its component's minimum height"""
         for i, height in enumerate(individual):
-            component_index = i % len(self.components)
+            if self.rng.random() >= indpb:
+                continue
+            component_index = i % len(self.components)  # Column-major layout, gene col * K + k
             component = self.components[component_index]
             min_height = self.min_heights[component]
 
             # Generate a new valid height as an integer multiple
-            individual[i] = random.randint(0, int(self.height // min_height)) * min_height
+            individual[i] = self.rng.randint(0, int(self.height // min_height)) * min_height
         
         # # Debug: Check the mutated individual
         # print("Mutated Individual:", individual)
 
         return (individual,)
 
+    def cx_two_point(self, ind1, ind2):
+        """tools.cxTwoPoint drawing from this optimiser's RNG"""
+        size = min(len(ind1), len(ind2))
+        cxpoint1 = self.rng.randint(1, size)
+        cxpoint2 = self.rng.randint(1, size - 1)
+        if cxpoint2 >= cxpoint1:
+            cxpoint2 += 1
+        else:  # Swap the two cx points
+            cxpoint1, cxpoint2 = cxpoint2, cxpoint1
+
+        ind1[cxpoint1:cxpoint2], ind2[cxpoint1:cxpoint2] = ind2[cxpoint1:cxpoint2], ind1[cxpoint1:cxpoint2]
+        return ind1, ind2
+
+    def select_tournament(self, individuals, k, tournsize):
+        """tools.selTournament drawing from this optimiser's RNG"""
+        chosen = []
+        for _ in range(k):
+            aspirants = [self.rng.choice(individuals) for _ in range(tournsize)]
+            chosen.append(max(aspirants, key=attrgetter("fitness")))
+        return chosen
+
+    def vary(self, population, cxpb, mutpb):
+        """algorithms.varAnd drawing from this optimiser's RNG"""
+        offspring = [self.toolbox.clone(ind) for ind in population]
+
+        # Apply crossover and mutation on the offspring
+        for i in range(1, len(offspring), 2):
+            if self.rng.random() < cxpb:
+                offspring[i - 1], offspring[i] = self.toolbox.mate(offspring[i - 1], offspring[i])
+                del offspring[i - 1].fitness.values, offspring[i].fitness.values
+
+        for i in range(len(offspring)):
+            if self.rng.random() < mutpb:
+                offspring[i], = self.toolbox.mutate(offspring[i])
+                del offspring[i].fitness.values
+
+        return offspring
+
     def evaluate(self, individual):
         """Evaluate fitness based on adherence to user preferences"""
         fitness = 0
         
-        # Calculate total space taken up by component
+        # Calculate total space taken up by component, gene col * K + k holds component k
         total_space_used = sum(individual)
         component_allocation = {
-            component: sum(individual[self.columns * i : self.columns * (i + 1)])
+            component: sum(individual[i::len(self.components)])
             for i, component in enumerate(self.components)
         }
 
@@ -113,54 +221,428 @@ class ClosetOptimiser:
 
         return fitness,
 
-    def optimise(self, population_size=None, generations=None, cxpb=0.5, mutpb=0.2):
+    def evaluate_population(self, genomes):
+        """Vectorised evaluate, scoring every row of a genome matrix in one pass.
+
+        Mirrors evaluate term for term (component totals over genes k::K, column totals over
+        consecutive runs of K genes) so the scores match the scalar reference exactly.
+        """
+        genomes = np.asarray(genomes, dtype=np.int64).reshape(-1, self.columns * len(self.components))
+        num_components = len(self.components)
+        capacity = self.columns * self.height
+        fitness = np.zeros(len(genomes))
+
+        # Penalise discrepancy in component percentage
+        component_allocation = genomes.reshape(-1, self.columns, num_components).sum(axis=1)
+        for comp_index, target_percentage in enumerate(self.preferences.values()):
+            allocated_percentage = (component_allocation[:, comp_index] / capacity) * 100
+            fitness -= np.abs(allocated_percentage - target_percentage)
+
+        # Penalise exceeding the total space, otherwise penalise under utilisation
+        unused_space = capacity - genomes.sum(axis=1)
+        fitness -= np.where(unused_space < 0, 100, unused_space / 50)
+
+        # Penalise exceeding each column's height
+        excess = genomes.reshape(-1, self.columns, num_components).sum(axis=2) - self.height
+        column_penalty = np.where(excess > 0, 100 + excess, 0)
+
+        # Penalise any violation of minimum height constraint
+        gene_steps = np.tile([self.min_heights[component] for component in self.components], self.columns)
+        modulo_penalty = np.where(genomes % gene_steps != 0, 100, 0)
+
+        # Subtract penalties one term at a time so rounding matches evaluate exactly
+        for penalty in column_penalty.T:
+            fitness -= penalty
+        for penalty in modulo_penalty.T:
+            fitness -= penalty
+
+        return fitness
+
+    def evaluate_offspring(self, offspring, batch=True):
+        """Score a matrix of gene units, only evaluating genomes the fitness cache has not seen before"""
+        if self.cache is None:
+            return self.score_genomes(self.decode(offspring), batch)
+        fits = self.cache.evaluate(
+            offspring,
+            lambda unseen: self.score_genomes(self.decode(np.array(unseen)), batch).tolist(),
+            key=np.ndarray.tobytes,  # Packed byte key of the compact genome
+        )
+        return np.array(fits)
+
+    def score_genomes(self, genomes, batch=True):
+        """Score a matrix of mm genomes with the worker pool, the vectorised path or the scalar reference"""
+        if self.pool is not None:
+            return self.pool.evaluate(self, genomes, batch)
+        if batch:
+            # Score the whole offspring set as one integer matrix
+            return self.evaluate_population(genomes)
+        return np.array([fit for fit, in self.toolbox.map(self.toolbox.evaluate, genomes.tolist())])
+
+    def encode(self, genomes):
+        """Convert mm genomes to compact gene units (multiples of each gene's minimum height)"""
+        return (np.asarray(genomes, dtype=np.int64) // self.gene_steps).astype(self.gene_dtype)
+
+    def decode(self, units):
+        """Convert compact gene units back to mm genomes"""
+        return units.astype(np.int64) * self.gene_steps
+
+    def vary_units(self, population, offspring, cxpb, mutpb, rng, indpb=INDPB, crossover=None):
+        """Array version of vary: fill the offspring buffer from the population, then cross and mutate in place.
+
+        crossover optionally gives an operator index per pair (see optimiser.adaptive.CROSSOVERS):
+        two point, uniform, or whole columns swapped with probability 0.5 each. Returns which pairs
+        were crossed.
+        """
+        np.copyto(offspring, population)
+        num_pairs, size = len(offspring) // 2, offspring.shape[1]
+        crossed = np.zeros(num_pairs, dtype=bool)
+
+        # Two point crossover of consecutive pairs, with the same cut point rules as cx_two_point
+        if size > 1 and num_pairs:
+            first, second = offspring[0:2 * num_pairs:2], offspring[1:2 * num_pairs:2]
+            cxpoint1 = rng.integers(1, size + 1, num_pairs)
+            cxpoint2 = rng.integers(1, size, num_pairs)
+            cxpoint2 = np.where(cxpoint2 >= cxpoint1, cxpoint2 + 1, cxpoint2)
+            low, high = np.minimum(cxpoint1, cxpoint2), np.maximum(cxpoint1, cxpoint2)
+            genes = np.arange(size)
+            crossed = rng.random(num_pairs) < cxpb
+            swap = crossed[:, np.newaxis] & (genes >= low[:, np.newaxis]) & (genes < high[:, np.newaxis])
+            if crossover is not None:
+                uniform = rng.random((num_pairs, size)) < 0.5
+                column = np.repeat(rng.random((num_pairs, self.columns)) < 0.5, size // self.columns, axis=1)
+                operator = crossover[:, np.newaxis]
+                swap = np.where(operator == 1, crossed[:, np.newaxis] & uniform,
+                                np.where(operator == 2, crossed[:, np.newaxis] & column, swap))
+            first_genes = np.where(swap, first, second)  # What the second individual takes
+            np.copyto(first, second, where=swap)
+            np.copyto(second, first_genes)
+
+        # Mutation redraws each gene of the chosen individuals with probability indpb, like constrained_mutate
+        mutants = rng.random(len(offspring)) < mutpb
+        genes = np.nonzero(mutants[:, np.newaxis] & (rng.random(offspring.shape) < indpb))
+        offspring[genes] = rng.integers(0, self.gene_max_units[genes[1]] + 1)
+        return crossed
+
+    def repair_units(self, units, rng):
+        """Project every column back within the closet height by removing whole steps from its genes.
+
+        Components are trimmed in a random order each call so no component is always cut first.
+        Genes stay on their height grid, so a repaired genome is always feasible.
+        """
+        num_components = len(self.components)
+        columns = units.reshape(len(units), self.columns, num_components)  # View, gene col * K + k
+        steps = self.gene_steps[:num_components]
+        excess = (columns.astype(np.int64) * steps).sum(axis=2) - self.height
+        for comp_index in rng.permutation(num_components):
+            if not (excess > 0).any():
+                break
+            needed = np.where(excess > 0, -(-excess // steps[comp_index]), 0)  # Ceiling division
+            removed = np.minimum(columns[:, :, comp_index], needed)
+            columns[:, :, comp_index] -= removed.astype(units.dtype)
+            excess -= removed * steps[comp_index]
+
+    def select_units(self, offspring, fits, population, tournsize, rng):
+        """Array version of select_tournament: copy the winners into the population buffer"""
+        aspirants = rng.integers(0, len(offspring), size=(len(population), tournsize))
+        winners = aspirants[np.arange(len(population)), np.argmax(fits[aspirants], axis=1)]
+        np.take(offspring, winners, axis=0, out=population)
+        return fits[winners]
+
+    def evolve_generation(self, population, offspring, rng, cxpb=0.5, mutpb=0.2, indpb=INDPB, repair=True, batch=True,
+                          profiler=None, tournsize=3, controller=None):
+        """Run one generation on the array buffers, returning the offspring and new population fitness.
+
+        With a profiler each phase is timed, and the offspring over the closet height before repair
+        and the evaluations the cache could not answer are counted. With an AdaptiveController the
+        controller's settings replace cxpb, mutpb and tournsize and it is credited with the results.
+        """
+        phase = profiler.phase if profiler is not None else _no_phase
+        crossover = None
+        if controller is not None:
+            cxpb, mutpb, tournsize, crossover = controller.settings(len(population) // 2, rng)
+        with phase("vary"):
+            crossed = self.vary_units(population, offspring, cxpb, mutpb, rng, indpb, crossover)
+        if profiler is not None:
+            num_components = len(self.components)
+            heights = (offspring.reshape(len(offspring), self.columns, num_components) * self.gene_steps[:num_components]).sum(axis=2)
+            profiler.count(offspring=len(offspring), infeasible=int((heights > self.height).any(axis=1).sum()))
+            hits, misses = (self.cache.hits, self.cache.misses) if self.cache is not None else (0, len(offspring))
+        if repair:
+            with phase("repair"):
+                self.repair_units(offspring, rng)
+        with phase("evaluate"):
+            fits = self.evaluate_offspring(offspring, batch)
+        if profiler is not None and self.cache is not None:
+            profiler.count(evaluations=self.cache.misses - misses, cache_hits=self.cache.hits - hits)
+        elif profiler is not None:
+            profiler.count(evaluations=misses)
+        if controller is not None:
+            controller.credit(fits, crossed, crossover)
+        with phase("select"):
+            population_fits = self.select_units(offspring, fits, population, tournsize, rng)
+        if controller is not None:
+            controller.adapt(population, population_fits, self.gene_max_units)
+        return fits, population_fits
+
+    def optimise(self, population_size=None, generations=None, cxpb=0.5, mutpb=0.2, batch=True, seed=None, engine="ga",
+                 patience=None, target_fitness=None, time_budget=None, callback=None, plot=True, warm_start=False,
+                 indpb=INDPB, repair=True, stats_sink=None, stats_every=1, heuristic_seeds=1, surrogate=None, profile=None,
+                 adaptive=False):
+        """Search for the best arrangement with the GA (engine="ga"), the exact lattice solver (engine="exact"),
+        the island model GA with default island settings (engine="islands", see optimise_islands),
+        the per-column decomposition (engine="decompose", see optimiser.decompose) for wide walls, the
+        learned surrogate (engine="surrogate", the given SurrogateModel or the default model file), the
+        two-objective NSGA-II (engine="nsga2", see optimise_pareto) or return ClosetDesigner's greedy
+        layout straight away as a preview (engine="heuristic").
+
+        The GA keeps the population as gene units in two preallocated arrays and swaps offspring
+        between them each generation, so no individual objects are created inside the loop.
+        The exact engine falls back to the GA when the lattice is too large to solve exhaustively, and
+        the surrogate engine when there is no model for this column count.
+        The GA stops early once the best fitness has not improved for `patience` generations, reaches
+        `target_fitness`, or has run for `time_budget` seconds, and always returns the best individual
+        seen so far. The reason is stored as self.logbook.stop_reason.
+
+        callback(gen, record, best_individual) is called after every generation, returning True from
+        it cancels the run. With plot=False no progress figure is built and None is returned for it.
+        With warm_start=True the run starts from the last final population for the same columns and
+        components (snapped to this closet's height grid) instead of a random one. The first
+        heuristic_seeds individuals after any warm start ones are the greedy layout and mutants of it.
+
+        Mutation redraws each gene of a mutant with probability indpb. With repair=True every offspring
+        is projected back within the closet height after crossover and mutation, so each evaluation is
+        spent on a feasible layout.
+
+        Stats go to stats_sink every stats_every generations (and always for the last generation):
+        None keeps them in a tools.Logbook, a path streams them to a JSONL or CSV file, a function is
+        called with each record, and any object with a record(**stats) method such as
+        optimiser.stats.RingBufferSink is used as is. The sink is kept as self.logbook. A progress
+        figure is only built when plot=True and the sink supports select().
+
+        With profile=True (or a PhaseProfiler, or inside optimiser.profiling.profiling) the time of
+        each phase, evaluation counts and the share of infeasible offspring are recorded, and the
+        report is left on self.profile and logbook.profile.
+
+        With adaptive=True (or an optimiser.adaptive.AdaptiveController) the GA adapts cxpb, mutpb and
+        the tournament size every generation, starting from cxpb and mutpb, and picks each pair's
+        crossover operator by its recent success. Only the engines in ADAPTIVE_ENGINES take it, nsga2
+        and islands raise ValueError rather than silently running with fixed settings.
+        """
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine '{engine}', expected one of {ENGINES}")
+        if adaptive and engine not in ADAPTIVE_ENGINES:
+            raise ValueError(f"adaptive operators are not supported by engine '{engine}', only by {ADAPTIVE_ENGINES}")
+        profiler = resolve_profiler(profile, self.profiler)
+        phase = profiler.phase if profiler is not None else _no_phase
+        self.pareto_front = None
+        if engine == "nsga2":
+            return self.optimise_pareto(
+                population_size, generations, seed=seed, cxpb=cxpb, mutpb=mutpb, indpb=indpb, repair=repair,
+                patience=patience, target_fitness=target_fitness, time_budget=time_budget, callback=callback,
+                plot=plot, warm_start=warm_start, stats_sink=stats_sink, stats_every=stats_every,
+                heuristic_seeds=heuristic_seeds, profile=profiler,
+            )
+        if engine == "islands":
+            return self.optimise_islands(
+                population_size, generations, seed=seed, cxpb=cxpb, mutpb=mutpb, indpb=indpb, repair=repair,
+                patience=patience, target_fitness=target_fitness, time_budget=time_budget, callback=callback,
+                plot=plot, warm_start=warm_start, stats_sink=stats_sink, stats_every=stats_every,
+                heuristic_seeds=heuristic_seeds, profile=profiler,
+            )
+        with phase("solve"):
+            if engine == "heuristic":
+                genome = self.heuristic_genome()
+            elif engine == "decompose":
+                genome = solve_decomposed(self)
+            elif engine == "surrogate":
+                model = surrogate if surrogate is not None else default_model()
+                genome = model.predict(self) if model is not None else None
+            elif engine == "exact":
+                genome = solve_exact(self)
+            else:
+                genome = None
+        if genome is not None:
+            return self.single_result(genome, plot, stats_sink, engine, profiler)
+
+        if seed is not None:
+            self.rng.seed(seed)
+        rng = np.random.default_rng(self.rng.getrandbits(64))  # Array operators draw from the instance RNG
         if population_size is None:
             population_size = int(self.alg_pref["Population"])
         if generations is None:
             generations = int(self.alg_pref["Generations"])
-        population = self.toolbox.population(n=population_size)
+        population = self.initial_population(population_size, warm_start, rng, heuristic_seeds)
+        offspring = np.empty_like(population)
+        controller = resolve_controller(adaptive, cxpb, mutpb)
 
-        # Statistics for tracking performance
-        stats = tools.Statistics(lambda ind: ind.fitness.values[0])
-        stats.register("max", max)
-        stats.register("avg", lambda fits: sum(fits) / len(fits))
-        
-        logbook = tools.Logbook()  # Logbook to store the evolution history
-        logbook.header = ["gen", "max", "avg"]  # Columns for tracking
+        logbook, owned_sink = make_sink(stats_sink, ["gen", "max", "avg", "hits", "misses"])
+        logbook.stop_reason = "generations"
+
+        best_units = population[0].copy()  # Best genome seen so far, for anytime results
+        best_fitness = -np.inf
+        start_time = time.perf_counter()
+        stale_generations = 0
+        generations_run = 0
+        hits, misses = (self.cache.hits, self.cache.misses) if self.cache is not None else (0, 0)
 
         # Evolutionary algorithm with tracking
-        for gen in range(generations):
-            offspring = algorithms.varAnd(population, self.toolbox, cxpb, mutpb)
-            fits = self.toolbox.map(self.toolbox.evaluate, offspring)
-            for ind, fit in zip(offspring, fits):
-                ind.fitness.values = fit
-            population[:] = self.toolbox.select(offspring, k=len(population))
-            
-            # Record stats for the current generation
-            record = stats.compile(population)
-            logbook.record(gen=gen, **record)
-        
-        # Get the best solution
-        best_individual = tools.selBest(population, k=1)[0]
-        fig = self.plot_progress(logbook)
+        try:
+            for gen in range(generations):
+                fits, population_fits = self.evolve_generation(population, offspring, rng, cxpb, mutpb, indpb, repair, batch,
+                                                               profiler, controller=controller)
+                generations_run += 1
+
+                # Stats for the current generation
+                with phase("stats"):
+                    record = {"max": float(population_fits.max()), "avg": float(population_fits.mean())}
+                    if self.cache is not None:
+                        # Cache hits and misses since the last recorded generation
+                        record.update(hits=self.cache.hits - hits, misses=self.cache.misses - misses)
+
+                # Convergence criteria
+                previous_best = best_fitness
+                best_index = int(np.argmax(fits))
+                if fits[best_index] > best_fitness:
+                    best_fitness = float(fits[best_index])
+                    best_units[:] = offspring[best_index]
+                stale_generations = 0 if best_fitness > previous_best else stale_generations + 1
+                stop_reason = None
+                with phase("callback"):
+                    cancelled = callback is not None and callback(gen, record, self.to_individual(best_units, best_fitness))
+                if cancelled:
+                    stop_reason = "cancelled"
+                elif target_fitness is not None and best_fitness >= target_fitness:
+                    stop_reason = "target"
+                elif patience is not None and stale_generations >= patience:
+                    stop_reason = "patience"
+                elif time_budget is not None and time.perf_counter() - start_time >= time_budget:
+                    stop_reason = "time_budget"
+
+                if should_record(gen, stats_every, stop_reason is not None or gen == generations - 1):
+                    with phase("stats"):
+                        logbook.record(gen=gen, **record)
+                    if self.cache is not None:
+                        hits, misses = self.cache.hits, self.cache.misses
+                if profiler is not None:
+                    profiler.end_generation(gen)
+                if stop_reason is not None:
+                    logbook.stop_reason = stop_reason
+                    break
+        finally:
+            if owned_sink:
+                logbook.close()
+
+        self.logbook = logbook  # Keep the history (or the custom sink) for callers that want the stats
+        if warm_start and generations_run:
+            self.store_warm_population(population, population_fits)
+
+        # Get the best solution seen during the run
+        if not generations_run:
+            best_fitness = float(self.score_genomes(self.decode(best_units), batch)[0])
+        best_individual = self.to_individual(best_units, best_fitness)
+        with phase("plot"):
+            fig = self.plot_progress(logbook) if plot and hasattr(logbook, "select") else None
+        self.store_profile(logbook, profiler)
 
         return best_individual, fig
-    
-    def plot_progress(self, logbook):
-        generations = logbook.select("gen")
-        max_fitness = logbook.select("max")
-        avg_fitness = logbook.select("avg")
-
-        fig, ax = plt.subplots(figsize=(10, 6))
-        ax.plot(generations, max_fitness, label="Max Fitness", color="blue")
-        ax.plot(generations, avg_fitness, label="Average Fitness", color="green")
-        ax.set_title("Algorithm Progress")
-        ax.set_xlabel("Generations")
-        ax.set_ylabel("Fitness")
-        ax.legend(loc="best")
-        ax.grid(True)
-
-        return fig  # Return the figure
+
+    def store_profile(self, logbook, profiler):
+        """Leave the run's profile report on the optimiser and the logbook, None when not profiled"""
+        self.profile = profiler.report() if profiler is not None else None
+        try:
+            logbook.profile = self.profile
+        except AttributeError:
+            pass  # Sinks with __slots__ cannot carry it
+
+    def optimise_islands(self, population_size=None, generations=None, **kwargs):
+        """Island model GA across worker processes, see optimiser.islands.optimise_islands for the options"""
+        from optimiser.islands import optimise_islands
+        return optimise_islands(self, population_size, generations, **kwargs)
+
+    def optimise_pareto(self, population_size=None, generations=None, **kwargs):
+        """NSGA-II over preference deviation and unused space, see optimiser.pareto.optimise_pareto for the options"""
+        from optimiser.pareto import optimise_pareto
+        return optimise_pareto(self, population_size, generations, **kwargs)
+
+    def to_individual(self, units, fitness):
+        """Build an Individual in mm from a compact genome and its fitness"""
+        individual = self.Individual(self.decode(units).tolist())
+        individual.fitness.values = (fitness,)
+        return individual
+
+    def warm_start_key(self):
+        """Warm starts are shared by optimisers with the same genome layout"""
+        return self.columns, tuple(self.components)
+
+    def initial_population(self, population_size, warm_start=False, rng=None, heuristic_seeds=0):
+        """Random population of gene units, seeded from an earlier run's final population when warm starting
+        and with heuristic_seeds copies of the greedy layout, all but the first mutated"""
+        rng = rng if rng is not None else np.random.default_rng(self.rng.getrandbits(64))
+        with self.warm_populations_lock:
+            seeds = self.warm_populations.get(self.warm_start_key(), []) if warm_start else []
+        seeds = [self.snap_to_grid(genome) for genome in seeds[:population_size]]
+
+        population = rng.integers(0, self.gene_max_units + 1, size=(population_size, len(self.gene_steps))).astype(self.gene_dtype)
+        if seeds:
+            population[:len(seeds)] = self.encode(seeds)
+
+        heuristic_seeds = min(heuristic_seeds, population_size - len(seeds))
+        if heuristic_seeds > 0:
+            heuristic = population[len(seeds):len(seeds) + heuristic_seeds]
+            heuristic[:] = self.encode([self.heuristic_genome()])
+            mutants = heuristic[1:]
+            redraw = rng.random(mutants.shape) < INDPB
+            mutants[redraw] = rng.integers(0, self.gene_max_units + 1, size=mutants.shape)[redraw]
+        return population
+
+    def heuristic_genome(self):
+        """ClosetDesigner's greedy layout for this closet as a genome in mm"""
+        designer = ClosetDesigner(self.width, self.height, self.columns, self.min_heights)
+        return designer.genome(self.preferences, self.components)
+
+    def store_warm_population(self, population, fits):
+        """Keep the final population, best first, for the next warm-started run with this layout"""
+        key = self.warm_start_key()
+        ranked = self.decode(population[np.argsort(-fits, kind="stable")]).tolist()
+        with self.warm_populations_lock:
+            self.warm_populations[key] = ranked
+            self.warm_populations.move_to_end(key)
+            while len(self.warm_populations) > self.warm_population_limit:
+                self.warm_populations.popitem(last=False)
+
+    def snap_to_grid(self, genome):
+        """Round each gene down onto its component's height grid within the closet height"""
+        snapped = []
+        for index, height in enumerate(genome):
+            min_height = self.min_heights[self.components[index % len(self.components)]]
+            snapped.append(min(height, self.height) // min_height * min_height)
+        return snapped
+
+    def single_result(self, genome, plot=True, stats_sink=None, stop_reason="exact", profiler=None):
+        """Package an exact solver or heuristic genome like a GA result, with a single-entry logbook"""
+        best_individual = self.Individual(genome)
+        best_individual.fitness.values = self.evaluate(best_individual)
+
+        logbook, owned_sink = make_sink(stats_sink, ["gen", "max", "avg"])
+        logbook.record(gen=0, max=best_individual.fitness.values[0], avg=best_individual.fitness.values[0])
+        logbook.stop_reason = stop_reason
+        if owned_sink:
+            logbook.close()
+        self.logbook = logbook
+
+        with (profiler.phase if profiler is not None else _no_phase)("plot"):
+            fig = self.plot_progress(logbook) if plot and hasattr(logbook, "select") else None
+        self.store_profile(logbook, profiler)
+        return best_individual, fig
+
+    def plot_progress(self, logbook=None):
+        """Plot max and average fitness per generation, with no logbook the lines start empty for live updates.
+
+        The figure is built without pyplot, so it is freed with its last reference instead of staying
+        open in pyplot's figure manager.
+        """
+        from optimiser.visualiser import progress_figure
+        return progress_figure(logbook)
 
     def map_individual_to_arrangement(self, individual):
         """Convert the individual into a dictionary mapping columns to components and their heights."""
@@ -184,6 +666,8 @@ class ClosetOptimiser:
 
 # Example usage
 if __name__ == "__main__":
+    import matplotlib.pyplot as plt
+
     # Closet parameters
     WIDTH = 100  # inches
     HEIGHT = 96  # inches
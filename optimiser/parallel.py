@@ -0,0 +1,98 @@
+import multiprocessing
+import os
+import pickle
+from collections import OrderedDict
+
+import numpy as np
+
+WORKER_CACHE_SIZE = 8  # Optimisers each worker keeps unpickled, so a shared pool can serve several at once
+_worker_optimisers = OrderedDict()  # Per worker process: optimiser by evaluation key, most recently used last
+
+
+def evaluation_key(optimiser):
+    """Everything evaluate depends on, so workers can reuse an optimiser across generations and runs"""
+    return repr((optimiser.width, optimiser.height, optimiser.columns, list(optimiser.preferences.items()),
+                 [optimiser.min_heights[component] for component in optimiser.components]))
+
+
+def _evaluate_chunk(task):
+    """Worker entry point: score one chunk of genomes with the optimiser cached under key.
+
+    The pickled optimiser only comes with the chunks of a key the parent has not sent before. A
+    worker that has not seen the key and got no state returns None, and the parent resends.
+    """
+    key, state, genomes, batch = task
+    optimiser = _worker_optimisers.get(key)
+    if optimiser is None:
+        if state is None:
+            return None
+        optimiser = _worker_optimisers[key] = pickle.loads(state)  # Rebuilds the toolbox once per worker
+        while len(_worker_optimisers) > WORKER_CACHE_SIZE:
+            _worker_optimisers.popitem(last=False)
+    else:
+        _worker_optimisers.move_to_end(key)
+    if batch:
+        return optimiser.evaluate_population(genomes)
+    return np.array([optimiser.evaluate(genome)[0] for genome in genomes.tolist()])
+
+
+class EvaluationPool:
+    """Pool of worker processes that score offspring in chunks.
+
+    The worker processes are started on first use and live until close() is called, so one
+    pool can serve every generation of a run and be shared across several optimisers. Tasks
+    carry plain integer matrices, never DEAP individuals. Each worker unpickles an optimiser once
+    and keeps it under its evaluation_key, so after the first generation only genome chunks are
+    sent.
+    """
+    def __init__(self, processes=None, chunks_per_worker=2):
+        self.processes = processes or os.cpu_count() or 1
+        self.chunks_per_worker = chunks_per_worker
+        self._pool = None
+        self._sent = set()  # Evaluation keys whose state has gone out to the current workers
+
+    def start(self):
+        """Start the worker processes if they are not already running."""
+        if self._pool is None:
+            self._pool = multiprocessing.Pool(self.processes)
+        return self
+
+    def close(self):
+        """Stop the worker processes."""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+            self._sent.clear()
+
+    def map(self, function, tasks):
+        """Run a picklable module-level function over tasks in the workers, keeping the input order."""
+        self.start()
+        return self._pool.map(function, tasks, chunksize=1)
+
+    def evaluate(self, optimiser, genomes, batch=True):
+        """Score every genome across the workers, returning fitness values in input order."""
+        self.start()
+        genomes = np.asarray(genomes, dtype=np.int64)
+        num_chunks = min(len(genomes), self.processes * self.chunks_per_worker) or 1
+        chunks = np.array_split(genomes, num_chunks)
+        key = evaluation_key(optimiser)
+        state = None
+        if key not in self._sent:
+            state = pickle.dumps(optimiser)  # Pickled once, every chunk shares the bytes
+            self._sent.add(key)
+        results = self._pool.map(_evaluate_chunk, [(key, state, chunk, batch) for chunk in chunks])
+
+        # Workers that have not seen this optimiser yet (or dropped it) get it with their chunk again
+        missing = [index for index, result in enumerate(results) if result is None]
+        if missing:
+            state = state if state is not None else pickle.dumps(optimiser)
+            for index, result in zip(missing, self._pool.map(_evaluate_chunk, [(key, state, chunks[index], batch) for index in missing])):
+                results[index] = result
+        return np.concatenate(results)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.close()
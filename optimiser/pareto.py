@@ -0,0 +1,257 @@
+"""Two-objective NSGA-II keeping the whole Pareto front of one run.
+
+evaluate folds how closely the split matches the preferences and how much space is left unused
+into one number. Here they are two objectives to minimise, the preference deviation and the
+unused space term (unused mm / 50, or 100 when over capacity), with evaluate's column and grid
+penalties added to both so infeasible layouts never dominate feasible ones. Every non-dominated
+layout seen during the run is kept, so a trade-off is a pick from that front instead of a new run:
+
+    best, fig = optimiser.optimise(engine="nsga2")
+    genome = optimiser.pareto_front.genome(utilisation_weight=2.0)
+
+Weight 1 minimises deviation + unused term, the scalar evaluate maximises, and is what optimise
+returns as the best individual.
+"""
+import time
+from contextlib import nullcontext
+
+import numpy as np
+
+from optimiser.profiling import resolve_profiler
+from optimiser.stats import make_sink, should_record
+
+
+def objective_terms(optimiser, genomes):
+    """evaluate's terms for every row of a mm genome matrix: preference deviation, unused space term and penalties.
+
+    Component totals are taken over genes k::K like evaluate does, so the three terms add up to
+    minus evaluate's fitness.
+    """
+    num_components = len(optimiser.components)
+    genomes = np.asarray(genomes, dtype=np.int64).reshape(-1, optimiser.columns * num_components)
+    capacity = optimiser.columns * optimiser.height
+
+    allocation = genomes.reshape(-1, optimiser.columns, num_components).sum(axis=1)
+    targets = np.array(list(optimiser.preferences.values()), dtype=float)
+    deviation = np.abs(allocation / capacity * 100 - targets).sum(axis=1)
+
+    unused_space = capacity - genomes.sum(axis=1)
+    unused = np.where(unused_space < 0, 100, unused_space / 50)
+
+    excess = genomes.reshape(-1, optimiser.columns, num_components).sum(axis=2) - optimiser.height
+    penalties = np.where(excess > 0, 100 + excess, 0).sum(axis=1)
+    penalties = penalties + np.where(genomes % optimiser.gene_steps != 0, 100, 0).sum(axis=1)
+    return deviation, unused, penalties
+
+
+def objectives(optimiser, genomes):
+    """(n, 2) matrix of minimised objectives and the scalar fitness of every mm genome"""
+    deviation, unused, penalties = objective_terms(optimiser, genomes)
+    return np.column_stack([deviation + penalties, unused + penalties]), -(deviation + unused + penalties)
+
+
+def distinct_points(points):
+    """Distinct rows of an (n, 2) matrix in lexicographic order, with each row's group, the group sizes and the
+    first row of every group (np.unique(axis=0) without its slow structured sort)"""
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    order = np.lexsort((points[:, 1], points[:, 0]))  # Stable, so the first row of a group is the earliest
+    ordered = points[order]
+    starts = np.ones(len(points), dtype=bool)
+    starts[1:] = (ordered[1:] != ordered[:-1]).any(axis=1)
+    groups = np.empty(len(points), dtype=np.int64)
+    groups[order] = np.cumsum(starts) - 1
+    return ordered[starts], groups, np.bincount(groups, minlength=int(starts.sum())), order[starts]
+
+
+def non_dominated_ranks(points, k=None):
+    """Front index of every row of an (n, 2) minimised objective matrix, 0 for the Pareto front.
+
+    Distinct points sorted lexicographically are dominated exactly when an earlier point has no
+    larger second objective, so each front is one running minimum over the points still unranked.
+    With k, sorting stops once at least k rows are ranked and the rest share the next index.
+    """
+    unique, groups, counts, _ = distinct_points(points)
+    ranks = np.empty(len(unique), dtype=np.int64)
+    remaining = np.arange(len(unique))
+    rank = 0
+    while remaining.size:
+        second = unique[remaining, 1]
+        earlier_min = np.minimum.accumulate(np.concatenate(([np.inf], second[:-1])))
+        front = second < earlier_min
+        ranks[remaining[front]] = rank
+        remaining = remaining[~front]
+        rank += 1
+        if k is not None and counts.sum() - counts[remaining].sum() >= k:
+            ranks[remaining] = rank
+            break
+    return ranks[groups]
+
+
+def crowding_distance(points, ranks):
+    """NSGA-II crowding distance of every row within its front, infinite at each front's extremes"""
+    distance = np.zeros(len(points))
+    for rank in np.unique(ranks):
+        members = np.flatnonzero(ranks == rank)
+        for objective in range(points.shape[1]):
+            order = members[np.argsort(points[members, objective], kind="stable")]
+            values = points[order, objective]
+            distance[order[[0, -1]]] = np.inf
+            if len(order) > 2 and values[-1] > values[0]:
+                distance[order[1:-1]] += (values[2:] - values[:-2]) / (values[-1] - values[0])
+    return distance
+
+
+def select_nsga2(points, k):
+    """Indices of the k rows NSGA-II keeps (whole fronts in order, the last one by crowding), with every row's rank
+    and crowding distance"""
+    ranks = non_dominated_ranks(points, k)
+    crowding = crowding_distance(points, ranks)
+    return np.lexsort((-crowding, ranks))[:k], ranks, crowding
+
+
+def select_parents(ranks, crowding, k, rng):
+    """Binary tournaments on front index, then crowding distance"""
+    first, second = rng.integers(0, len(ranks), size=(2, k))
+    second_wins = (ranks[second] < ranks[first]) | ((ranks[second] == ranks[first]) & (crowding[second] > crowding[first]))
+    return np.where(second_wins, second, first)
+
+
+class ParetoFront:
+    """Non-dominated layouts of a run, one per objective point, ordered from most to least unused space"""
+
+    def __init__(self, genomes, points):
+        genomes, points = np.asarray(genomes, dtype=np.int64), np.asarray(points, dtype=float).reshape(-1, 2)
+        order = np.lexsort((points[:, 1], points[:, 0]))
+        self.genomes = genomes[order]  # mm genomes, one row per layout
+        self.points = points[order]  # (preference deviation, unused space term) of each layout
+
+    def __len__(self):
+        return len(self.genomes)
+
+    def update(self, genomes, points):
+        """Front of this front and new layouts, keeping the earliest layout for each objective point"""
+        unique, _, _, first = distinct_points(np.concatenate([self.points, points]))
+        front = non_dominated_ranks(unique) == 0
+        return ParetoFront(np.concatenate([self.genomes, genomes])[first[front]], unique[front])
+
+    def pick(self, utilisation_weight=1.0):
+        """Index of the layout with the lowest deviation + utilisation_weight * unused space term"""
+        return int(np.argmin(self.points[:, 0] + utilisation_weight * self.points[:, 1]))
+
+    def genome(self, utilisation_weight=1.0):
+        return self.genomes[self.pick(utilisation_weight)].tolist()
+
+    def to_payload(self):
+        return {"genomes": self.genomes.tolist(), "points": self.points.tolist()}
+
+    @classmethod
+    def from_payload(cls, payload):
+        return cls(payload["genomes"], payload["points"])
+
+
+def front_individual(optimiser, front, utilisation_weight=1.0):
+    """Individual for a pick from the front, with evaluate's fitness"""
+    individual = optimiser.Individual(front.genome(utilisation_weight))
+    individual.fitness.values = optimiser.evaluate(individual)
+    return individual
+
+
+def optimise_pareto(optimiser, population_size=None, generations=None, seed=None, cxpb=0.5, mutpb=0.2, indpb=None,
+                    repair=True, patience=None, target_fitness=None, time_budget=None, callback=None, plot=True,
+                    warm_start=False, stats_sink=None, stats_every=1, heuristic_seeds=1, profile=None):
+    """NSGA-II on the optimiser's array operators, leaving the front of every layout seen on optimiser.pareto_front.
+
+    Parents are drawn by binary tournaments on front index and crowding distance, varied and
+    repaired like the GA's offspring, and parents plus offspring are cut back to population_size
+    by select_nsga2. The logbook records the best and mean scalar fitness and the front size each
+    generation, stopping criteria, callback, stats_sink, warm starts and profiling work as in
+    ClosetOptimiser.optimise on the scalar fitness. Returns the weight 1 pick from the front.
+    """
+    if seed is not None:
+        optimiser.rng.seed(seed)
+    rng = np.random.default_rng(optimiser.rng.getrandbits(64))
+    if population_size is None:
+        population_size = int(optimiser.alg_pref["Population"])
+    if generations is None:
+        generations = int(optimiser.alg_pref["Generations"])
+    if indpb is None:
+        from optimiser.optimiser_core import INDPB
+        indpb = INDPB
+    profiler = resolve_profiler(profile, optimiser.profiler)
+    phase = profiler.phase if profiler is not None else (lambda name: nullcontext())
+
+    population = optimiser.initial_population(population_size, warm_start, rng, heuristic_seeds)
+    offspring = np.empty_like(population)
+    points, fits = objectives(optimiser, optimiser.decode(population))
+    ranks = non_dominated_ranks(points)
+    crowding = crowding_distance(points, ranks)
+    front = ParetoFront(optimiser.decode(population[ranks == 0]), points[ranks == 0])
+
+    logbook, owned_sink = make_sink(stats_sink, ["gen", "max", "avg", "front"])
+    logbook.stop_reason = "generations"
+    start_time = time.perf_counter()
+    best_fitness, stale_generations = -np.inf, 0
+    try:
+        for gen in range(generations):
+            with phase("select"):
+                parents = population[select_parents(ranks, crowding, population_size, rng)]
+            with phase("vary"):
+                optimiser.vary_units(parents, offspring, cxpb, mutpb, rng, indpb)
+            if repair:
+                with phase("repair"):
+                    optimiser.repair_units(offspring, rng)
+            with phase("evaluate"):
+                offspring_genomes = optimiser.decode(offspring)
+                offspring_points, offspring_fits = objectives(optimiser, offspring_genomes)
+                front = front.update(offspring_genomes, offspring_points)
+            if profiler is not None:
+                profiler.count(offspring=len(offspring), evaluations=len(offspring))
+
+            with phase("select"):
+                combined = np.concatenate([population, offspring])
+                combined_points = np.concatenate([points, offspring_points])
+                combined_fits = np.concatenate([fits, offspring_fits])
+                chosen, combined_ranks, combined_crowding = select_nsga2(combined_points, population_size)
+                population, points, fits = combined[chosen], combined_points[chosen], combined_fits[chosen]
+                ranks, crowding = combined_ranks[chosen], combined_crowding[chosen]
+
+            with phase("stats"):
+                record = {"max": float(fits.max()), "avg": float(fits.mean()), "front": len(front)}
+
+            previous_best = best_fitness
+            best_fitness = max(best_fitness, float(offspring_fits.max()))
+            stale_generations = 0 if best_fitness > previous_best else stale_generations + 1
+            stop_reason = None
+            with phase("callback"):
+                cancelled = callback is not None and callback(gen, record, front_individual(optimiser, front))
+            if cancelled:
+                stop_reason = "cancelled"
+            elif target_fitness is not None and best_fitness >= target_fitness:
+                stop_reason = "target"
+            elif patience is not None and stale_generations >= patience:
+                stop_reason = "patience"
+            elif time_budget is not None and time.perf_counter() - start_time >= time_budget:
+                stop_reason = "time_budget"
+
+            if should_record(gen, stats_every, stop_reason is not None or gen == generations - 1):
+                with phase("stats"):
+                    logbook.record(gen=gen, **record)
+            if profiler is not None:
+                profiler.end_generation(gen)
+            if stop_reason is not None:
+                logbook.stop_reason = stop_reason
+                break
+    finally:
+        if owned_sink:
+            logbook.close()
+
+    optimiser.logbook = logbook
+    optimiser.pareto_front = front
+    if warm_start:
+        optimiser.store_warm_population(population, fits)
+
+    best_individual = front_individual(optimiser, front)
+    with phase("plot"):
+        fig = optimiser.plot_progress(logbook) if plot and hasattr(logbook, "select") else None
+    optimiser.store_profile(logbook, profiler)
+    return best_individual, fig
@@ -0,0 +1,81 @@
+"""Per-phase timing of the evolutionary loop.
+
+    with profiling(optimiser) as profiler:
+        optimiser.optimise()
+    print(profiler.report())
+
+or optimise(profile=True), which leaves the same report on optimiser.profile and on the
+logbook. A profiler's callback(gen, timings) is called after every generation with that
+generation's phase times, evaluation counts and infeasible offspring.
+"""
+import time
+from contextlib import contextmanager
+
+PHASES = ("vary", "repair", "evaluate", "select", "stats", "callback", "plot")
+
+
+class PhaseProfiler:
+    """Cumulative and per-generation wall time of each phase, with evaluation and feasibility counts"""
+
+    def __init__(self, callback=None, keep_generations=True):
+        self.callback = callback
+        self.keep_generations = keep_generations  # Keep every generation's timings for the report
+        self.totals = dict.fromkeys(PHASES, 0.0)
+        self.current = {}
+        self.generations = []
+        self.counts = {"generations": 0, "offspring": 0, "evaluations": 0, "cache_hits": 0, "infeasible": 0}
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.totals[name] = self.totals.get(name, 0.0) + elapsed
+            self.current[name] = self.current.get(name, 0.0) + elapsed
+
+    def count(self, **counts):
+        """Add to the counters of this generation"""
+        for name, value in counts.items():
+            self.current[name] = self.current.get(name, 0) + value
+            self.counts[name] = self.counts.get(name, 0) + value
+
+    def end_generation(self, gen):
+        timings, self.current = self.current, {}
+        self.counts["generations"] += 1
+        if self.keep_generations:
+            self.generations.append(dict(timings, gen=gen))
+        if self.callback is not None:
+            self.callback(gen, timings)
+
+    def report(self):
+        """Totals per phase with their share of the profiled time, counts and the infeasible share"""
+        profiled = sum(self.totals.values())
+        return {
+            "seconds": dict(self.totals),
+            "share": {name: seconds / profiled if profiled else 0.0 for name, seconds in self.totals.items()},
+            "counts": dict(self.counts),
+            "infeasible_share": self.counts["infeasible"] / self.counts["offspring"] if self.counts["offspring"] else 0.0,
+            "generations": list(self.generations),
+        }
+
+
+def resolve_profiler(profile, default=None):
+    """optimise()'s profile argument: True for a new PhaseProfiler, a profiler as is, otherwise the default"""
+    if profile is True:
+        return PhaseProfiler()
+    if profile:
+        return profile
+    return default
+
+
+@contextmanager
+def profiling(optimiser, callback=None):
+    """Profile every optimise() call of an optimiser inside the block"""
+    profiler = PhaseProfiler(callback)
+    previous, optimiser.profiler = optimiser.profiler, profiler
+    try:
+        yield profiler
+    finally:
+        optimiser.profiler = previous
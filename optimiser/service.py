@@ -0,0 +1,215 @@
+"""Long-running local optimisation service over HTTP/JSON.
+
+    python -m optimiser.service --port 8765 --workers 4
+
+POST /optimise takes one spec in the batch format (width, height, percentages and optional
+population, generations, seed, engine, plus "timeout" in seconds) and answers with the same
+JSON result as optimiser.batch. GET /metrics reports queue depth and latency percentiles and
+GET /health answers once the workers are warm.
+
+Runs happen in a pool of worker processes started and warmed up (imports, DEAP types, a first
+small run) before the server accepts requests. Identical specs in flight share one run, at most
+--max-queue distinct runs are queued or running (further ones get 503) and a request waiting
+longer than its timeout gets 504 while its run carries on for anyone else waiting on it. The
+server only listens on localhost.
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from optimiser.batch import DEFAULT_GENERATIONS, DEFAULT_POPULATION, parse_spec, run_spec
+
+os.environ.setdefault("MPLBACKEND", "Agg")  # Never let matplotlib pick an interactive backend
+
+DEFAULT_PORT = 8765
+LATENCY_WINDOW = 1000  # Requests kept for the latency percentiles
+
+
+class QueueFull(Exception):
+    """Raised when a new run would exceed the service's queue bound"""
+
+
+def _warm_worker():
+    """Worker initialiser: pay the import and first-run costs before any request arrives"""
+    from optimiser.optimiser_core import ClosetOptimiser
+
+    optimiser = ClosetOptimiser(2540, 2176, {"shelves": 50, "drawers": 50}, {"Population": 10, "Generations": 2})
+    optimiser.optimise(seed=0, plot=False)
+
+
+def _ready():
+    return os.getpid()
+
+
+class OptimisationService:
+    """Bounded, deduplicating front end to a pool of warm optimiser processes"""
+
+    def __init__(self, workers=None, max_queue=64, timeout=30.0, store=None, defaults=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self.timeout = timeout  # Default seconds a request waits for its result
+        self.store = store  # Result store path, checked and filled by the workers
+        self.defaults = defaults or {"population": DEFAULT_POPULATION, "generations": DEFAULT_GENERATIONS,
+                                     "seed": None, "engine": "ga"}
+        self.executor = None
+        self.lock = threading.Lock()
+        self.in_flight = {}  # Job key -> Future of the run serving every identical request
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.counters = {"requests": 0, "completed": 0, "deduplicated": 0, "rejected": 0, "timeouts": 0, "errors": 0}
+
+    def start(self):
+        """Start the worker processes and wait until every one of them is warm"""
+        self.executor = ProcessPoolExecutor(self.workers, initializer=_warm_worker)
+        for future in [self.executor.submit(_ready) for _ in range(self.workers)]:
+            future.result()
+        return self
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
+
+    def submit(self, job):
+        """Future for a parsed job, shared with an identical job already in flight"""
+        key = json.dumps({name: value for name, value in job.items() if name != "id"}, sort_keys=True)
+        with self.lock:
+            future = self.in_flight.get(key)
+            if future is not None:
+                self.counters["deduplicated"] += 1
+                return future
+            if len(self.in_flight) >= self.max_queue:
+                self.counters["rejected"] += 1
+                raise QueueFull(f"{len(self.in_flight)} runs already queued")
+            future = self.in_flight[key] = self.executor.submit(run_spec, job)
+        future.add_done_callback(lambda _: self.finish(key))
+        return future
+
+    def finish(self, key):
+        with self.lock:
+            self.in_flight.pop(key, None)
+
+    def optimise(self, spec):
+        """Answer one request, returning (HTTP status, JSON payload)"""
+        start = time.perf_counter()
+        with self.lock:
+            self.counters["requests"] += 1
+        try:
+            timeout = float(spec.pop("timeout", self.timeout))
+            spec.setdefault("id", "request")
+            job = parse_spec(spec, self.defaults)
+            job["store"] = self.store
+            result = self.submit(job).result(timeout=timeout)
+        except (KeyError, TypeError, ValueError) as e:  # TypeError from fields of the wrong type, e.g. "width": null
+            status, result = 400, {"error": f"{type(e).__name__}: {e}"}
+        except QueueFull as e:
+            status, result = 503, {"error": str(e)}
+        except TimeoutError:
+            status, result = 504, {"error": f"No result within {timeout} s"}
+        except Exception as e:
+            status, result = 500, {"error": f"{type(e).__name__}: {e}"}
+        else:
+            status, result = 200, dict(result, id=job["id"])
+
+        with self.lock:
+            if status == 200:
+                self.counters["completed"] += 1
+                self.latencies.append(time.perf_counter() - start)
+            elif status == 504:
+                self.counters["timeouts"] += 1
+            elif status != 503:  # Rejections are counted by submit
+                self.counters["errors"] += 1
+        return status, result
+
+    def metrics(self):
+        with self.lock:
+            latencies = np.array(self.latencies)
+            queue_depth = len(self.in_flight)
+            counters = dict(self.counters)
+        percentiles = {f"p{q}": float(np.percentile(latencies, q)) * 1000 if len(latencies) else None for q in (50, 90, 99)}
+        return {"queue_depth": queue_depth, "max_queue": self.max_queue, "workers": self.workers,
+                "latency_ms": percentiles, **counters}
+
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    """Routes requests to the server's OptimisationService"""
+
+    def do_GET(self):
+        if self.path == "/metrics":
+            self.reply(200, self.server.service.metrics())
+        elif self.path == "/health":
+            self.reply(200, {"status": "ok"})
+        else:
+            self.reply(404, {"error": f"Unknown path {self.path}"})
+
+    def do_POST(self):
+        if self.path != "/optimise":
+            self.reply(404, {"error": f"Unknown path {self.path}"})
+            return
+        try:
+            spec = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        except ValueError as e:
+            self.reply(400, {"error": f"Invalid JSON: {e}"})
+            return
+        if not isinstance(spec, dict):
+            self.reply(400, {"error": "Expected a JSON object"})
+            return
+        self.reply(*self.server.service.optimise(spec))
+
+    def reply(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Requests are counted in /metrics instead of logged
+
+
+def make_server(service, port=DEFAULT_PORT, host="127.0.0.1"):
+    """HTTP server for a started service, port 0 picks a free port (see server.server_address)"""
+    server = ThreadingHTTPServer((host, port), ServiceHandler)
+    server.daemon_threads = True
+    server.service = service
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve closet optimisation over HTTP/JSON on localhost.")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port on 127.0.0.1")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--max-queue", type=int, default=64, help="Most distinct runs queued or running at once")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Default seconds a request waits for its result")
+    parser.add_argument("--store", default=None, help="Result store to check first and fill (default: the shared store)")
+    parser.add_argument("--no-store", action="store_true", help="Always optimise, never read or write the result store")
+    args = parser.parse_args(argv)
+
+    store = None
+    if not args.no_store:
+        from optimiser.store import DEFAULT_PATH, ResultStore
+
+        store = ResultStore(args.store or DEFAULT_PATH).path
+    service = OptimisationService(args.workers, args.max_queue, args.timeout, store).start()
+    server = make_server(service, args.port)
+    print(f"Serving on http://127.0.0.1:{server.server_address[1]} with {service.workers} warm workers", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""Sinks for the per-generation stats of a run.
+
+A sink is any object with a record(gen=..., **stats) method, which is what deap's tools.Logbook
+already provides and is still the default. The sinks here stream the stats somewhere else so
+long or headless runs do not have to keep the whole history in memory.
+"""
+import csv
+import json
+from collections import deque
+
+
+class CallbackSink:
+    """Pass every record to a function as a dict"""
+
+    def __init__(self, function):
+        self.function = function
+
+    def record(self, **record):
+        self.function(record)
+
+    def close(self):
+        pass
+
+
+class FileSink:
+    """Append records to a JSONL file, or a CSV file when the path ends in .csv"""
+
+    def __init__(self, path, mode="w"):
+        self.path = path
+        self.file = open(path, mode, newline="")
+        self.writer = None  # CSV writer, created on the first record so the header matches its keys
+        self.csv = str(path).endswith(".csv")
+
+    def record(self, **record):
+        if not self.csv:
+            self.file.write(json.dumps(record) + "\n")
+            return
+        if self.writer is None:
+            self.writer = csv.DictWriter(self.file, fieldnames=list(record))
+            self.writer.writeheader()
+        self.writer.writerow(record)
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class RingBufferSink:
+    """Keep only the last `size` records, with Logbook style select() for plotting"""
+
+    def __init__(self, size=1000):
+        self.records = deque(maxlen=size)
+
+    def record(self, **record):
+        self.records.append(record)
+
+    def select(self, *keys):
+        columns = [[record.get(key) for record in self.records] for key in keys]
+        return columns[0] if len(columns) == 1 else tuple(columns)
+
+    def close(self):
+        pass
+
+    def __len__(self):
+        return len(self.records)
+
+    def __iter__(self):
+        return iter(self.records)
+
+
+def make_sink(sink, header):
+    """Resolve a stats_sink argument: None gives a fresh Logbook, a path a FileSink and a function a CallbackSink.
+
+    Returns the sink and whether it was created here, in which case the caller closes it after the run.
+    """
+    if sink is None:
+        from deap import tools
+
+        logbook = tools.Logbook()
+        logbook.header = header
+        return logbook, False
+    if isinstance(sink, str) or hasattr(sink, "__fspath__"):
+        return FileSink(sink), True
+    if not hasattr(sink, "record") and callable(sink):
+        return CallbackSink(sink), False
+    return sink, False
+
+
+def should_record(gen, stats_every, last):
+    """Record every stats_every-th generation and always the last one of a run"""
+    return last or gen % stats_every == 0
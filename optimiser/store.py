@@ -0,0 +1,163 @@
+"""Content-addressed store of optimisation results on disk.
+
+Results are kept in an SQLite database in WAL mode, keyed by a hash of everything that decides a
+run's outcome: closet size and columns, the preferences (zero entries dropped, order kept as it
+sets the genome layout), the algorithm parameters, the seed and a hash of the optimiser source.
+Each operation opens its own connection, so one store can be shared by threads and processes.
+Only reproducible runs go through the store: unseeded runs, runs with a time_budget and warm
+started runs (whose start population is not in the key) are always optimised and never stored.
+"""
+import hashlib
+import inspect
+import json
+import os
+import sqlite3
+import time
+from contextlib import closing
+
+DEFAULT_PATH = os.environ.get("CLOSET_RESULT_STORE", os.path.join(os.path.expanduser("~"), ".cache", "ai-closet", "results.sqlite3"))
+SOURCE_MODULES = ("optimiser_core.py", "exact.py", "decompose.py", "designer.py", "islands.py", "surrogate.py",
+                  "pareto.py", "adaptive.py", "config.py")
+IGNORED_OPTIONS = {"callback", "plot", "stats_sink", "stats_every", "batch", "profile"}  # Do not change the result
+
+_version = None
+
+
+def optimiser_version():
+    """Hash of the optimiser source, so results from older code are never returned"""
+    global _version
+    if _version is None:
+        digest = hashlib.sha256()
+        directory = os.path.dirname(os.path.abspath(__file__))
+        for name in SOURCE_MODULES:
+            with open(os.path.join(directory, name), "rb") as f:
+                digest.update(f.read())
+        _version = digest.hexdigest()[:16]
+    return _version
+
+
+def result_key(optimiser, options):
+    """Key for an optimise() call, with every option resolved against its default"""
+    parameters = inspect.signature(optimiser.optimise).parameters
+    resolved = {name: options.get(name, parameter.default) for name, parameter in parameters.items()
+                if name not in IGNORED_OPTIONS}
+    if resolved["population_size"] is None:
+        resolved["population_size"] = int(optimiser.alg_pref["Population"])
+    if resolved["generations"] is None:
+        resolved["generations"] = int(optimiser.alg_pref["Generations"])
+    if resolved["engine"] == "surrogate" and resolved["surrogate"] is None:
+        from optimiser.surrogate import default_model
+        resolved["surrogate"] = default_model()  # Retraining the default model changes the key
+
+    query = {
+        "width": optimiser.width,
+        "height": optimiser.height,
+        "columns": optimiser.columns,
+        "preferences": [[component, float(value)] for component, value in optimiser.preferences.items()],
+        "options": resolved,
+        "version": optimiser_version(),
+    }
+    return hashlib.sha256(json.dumps(query, sort_keys=True, default=repr).encode()).hexdigest()  # Models hash by content
+
+
+def reproducible(options):
+    """Whether an optimise() call always gives the same result: seeded, no time budget and no warm start"""
+    return options.get("seed") is not None and options.get("time_budget") is None and not options.get("warm_start")
+
+
+class ResultStore:
+    """SQLite result store, safe to read and write from several threads and processes at once"""
+
+    def __init__(self, path=DEFAULT_PATH, timeout=30):
+        self.path = path
+        self.timeout = timeout  # Seconds to wait for another writer's lock
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with closing(self.connect()) as connection, connection:
+            connection.execute("PRAGMA journal_mode=WAL")  # Readers never block the writer
+            connection.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, created REAL, payload TEXT)")
+
+    def connect(self):
+        return sqlite3.connect(self.path, timeout=self.timeout)
+
+    def get(self, key):
+        """Stored payload for a key, or None"""
+        with closing(self.connect()) as connection:
+            row = connection.execute("SELECT payload FROM results WHERE key = ?", (key,)).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def put(self, key, payload):
+        with closing(self.connect()) as connection, connection:
+            connection.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?)", (key, time.time(), json.dumps(payload)))
+
+    def __len__(self):
+        with closing(self.connect()) as connection:
+            return connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def optimise(self, optimiser, **options):
+        """optimiser.optimise(**options) through the store, returning (best_individual, fig, hit).
+
+        A hit is answered by load without running anything. Runs that are not reproducible bypass
+        the store.
+        """
+        if not reproducible(options):
+            best_individual, fig = optimiser.optimise(**options)
+            return best_individual, fig, False
+
+        stored = self.load(optimiser, **options)
+        if stored is not None:
+            return stored + (True,)
+        best_individual, fig = optimiser.optimise(**options)
+        if getattr(optimiser.logbook, "stop_reason", None) != "cancelled":  # A cancelled run is not the answer
+            self.put(result_key(optimiser, options), result_payload(optimiser, best_individual))
+        return best_individual, fig, False
+
+    def load(self, optimiser, **options):
+        """Stored (best_individual, fig) for optimiser.optimise(**options), or None.
+
+        Rebuilds the best individual, a compact logbook (gen, max, avg and the stop reason) and, for
+        nsga2 runs, the Pareto front on the optimiser. Figures are never stored, so the progress
+        figure is built from the stored logbook when plot is set.
+        """
+        from deap import tools
+
+        if not reproducible(options):
+            return None
+        payload = self.get(result_key(optimiser, options))
+        if payload is None:
+            return None
+
+        best_individual = optimiser.Individual(payload["best_individual"])
+        best_individual.fitness.values = (payload["fitness"],)
+        logbook = tools.Logbook()
+        logbook.header = ["gen", "max", "avg"]
+        for gen, max_fitness, avg_fitness in zip(*(payload["logbook"][column] for column in logbook.header)):
+            logbook.record(gen=gen, max=max_fitness, avg=avg_fitness)
+        logbook.stop_reason = payload["stop_reason"]
+        optimiser.logbook = logbook
+        if payload.get("pareto_front") is not None:
+            from optimiser.pareto import ParetoFront
+            optimiser.pareto_front = ParetoFront.from_payload(payload["pareto_front"])
+        fig = optimiser.plot_progress(logbook) if options.get("plot", True) else None
+        return best_individual, fig
+
+
+def result_payload(optimiser, best_individual):
+    """JSON-serialisable record of a finished run"""
+    logbook = optimiser.logbook
+    if hasattr(logbook, "select"):
+        history = dict(zip(("gen", "max", "avg"), logbook.select("gen", "max", "avg")))
+    else:
+        history = {"gen": [], "max": [], "avg": []}  # Streamed to a custom sink, nothing to keep
+    arrangement = optimiser.map_individual_to_arrangement(best_individual)
+    return {
+        "best_individual": [int(height) for height in best_individual],
+        "fitness": best_individual.fitness.values[0],
+        "arrangement": [
+            {"column": column, "component": component, "height": int(height)}
+            for (column, component), height in arrangement.items()
+        ],
+        "logbook": {key: [(int if key == "gen" else float)(value) for value in values] for key, values in history.items()},
+        "stop_reason": getattr(logbook, "stop_reason", None),
+        "pareto_front": optimiser.pareto_front.to_payload() if optimiser.pareto_front is not None else None,
+    }
@@ -0,0 +1,183 @@
+"""Learned surrogate that predicts a layout genome straight from a closet spec.
+
+Training runs ClosetOptimiser over a grid of widths, heights and preference splits and keeps, per
+column count, every spec with its solved (column, component) heights as shares of the closet
+height. A prediction takes the layouts of the nearest training specs (NumPy only), snaps them
+onto the height grid, repairs them to fit every column and polishes the best with a short
+batched hill climb, which takes a few milliseconds:
+
+    python -m optimiser.surrogate train -o surrogate.npz
+    python -m benchmarks.surrogate_report surrogate.npz
+
+optimise(engine="surrogate") uses the default model file and falls back to the GA for column
+counts the model was not trained on.
+"""
+import argparse
+import hashlib
+import itertools
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from optimiser.config import MIN_HEIGHTS
+
+COMPONENTS = list(MIN_HEIGHTS)  # Fixed component order of the features and outputs
+DEFAULT_MODEL_PATH = os.environ.get("CLOSET_SURROGATE_MODEL", os.path.join(os.path.expanduser("~"), ".cache", "ai-closet", "surrogate.npz"))
+TRAIN_WIDTHS = (1200, 1800, 2540, 3200, 5000)
+TRAIN_HEIGHTS = (1600, 2176, 2400)
+TRAIN_ALG_PREF = {"Population": 200, "Generations": 50}
+
+_default_model = (None, None)  # (mtime, model) of the last loaded default model file
+
+
+def spec_features(width, height, preferences):
+    """Spec scaled to comparable ranges: width and height in metres, preferences as fractions"""
+    return np.array([width / 1000, height / 1000] + [preferences.get(component, 0) / 100 for component in COMPONENTS])
+
+
+def layout_shares(optimiser, genome):
+    """Genome as every (column, component) height over the closet height, zero for unused components"""
+    shares = np.zeros((optimiser.columns, len(COMPONENTS)))
+    num_components = len(optimiser.components)
+    for index, height in enumerate(genome):
+        shares[index // num_components, COMPONENTS.index(optimiser.components[index % num_components])] = height
+    return (shares / optimiser.height).ravel()
+
+
+def training_specs(widths=TRAIN_WIDTHS, heights=TRAIN_HEIGHTS, step=25):
+    """Every width and height with every preference split in `step` percent increments"""
+    splits = [split for split in itertools.product(range(0, 101, step), repeat=len(COMPONENTS)) if sum(split) == 100]
+    return [(width, height, dict(zip(COMPONENTS, split))) for width in widths for height in heights for split in splits]
+
+
+def _solve_spec(task):
+    """Worker entry point: optimise one training spec, returning its features, column count and layout"""
+    (width, height, preferences), alg_pref, seed = task
+    from optimiser.optimiser_core import ClosetOptimiser
+
+    optimiser = ClosetOptimiser(width, height, preferences, alg_pref)
+    best, _ = optimiser.optimise(seed=seed, plot=False)
+    return spec_features(width, height, preferences), optimiser.columns, layout_shares(optimiser, best)
+
+
+def build_training_set(specs, alg_pref=TRAIN_ALG_PREF, seed=0, workers=None):
+    """Run the GA on every spec across worker processes"""
+    tasks = [(spec, alg_pref, seed + index) for index, spec in enumerate(specs)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_solve_spec, tasks, chunksize=8))
+
+
+class SurrogateModel:
+    """Nearest neighbour model per column count from spec features to solved layout shares.
+
+    The fitness landscape has many equally good layouts, so averaging neighbours (or fitting a
+    regression) blends different optima into a poor layout. Instead the layouts of the nearest
+    training specs are all snapped onto the new closet's grid and repaired, scored in one batch,
+    and the best is polished.
+    """
+
+    def __init__(self, features=None, layouts=None, neighbours=20):
+        self.features = dict(features or {})  # columns -> (samples, num_features) array
+        self.layouts = dict(layouts or {})  # columns -> (samples, columns * len(COMPONENTS)) array
+        self.neighbours = neighbours
+
+    def fit(self, samples):
+        """Keep (features, columns, layout shares) samples grouped by column count"""
+        for columns in sorted({columns for _, columns, _ in samples}):
+            self.features[columns] = np.array([f for f, c, _ in samples if c == columns])
+            self.layouts[columns] = np.array([t for _, c, t in samples if c == columns])
+        return self
+
+    def predict(self, optimiser, polish_steps=20):
+        """Feasible genome (mm) for an optimiser's closet, or None when no model covers its column count"""
+        features = self.features.get(optimiser.columns)
+        if features is None:
+            return None
+        query = spec_features(optimiser.width, optimiser.height, optimiser.preferences)
+        nearest = np.argsort(((features - query) ** 2).sum(axis=1), kind="stable")[:self.neighbours]
+        component_indices = [COMPONENTS.index(component) for component in optimiser.components]
+        shares = self.layouts[optimiser.columns][nearest].reshape(len(nearest), optimiser.columns, len(COMPONENTS))
+        shares = shares[:, :, component_indices].reshape(len(nearest), -1)
+
+        # Nearest point on the height grid for every candidate, then repair, pick the best and polish
+        units = np.clip(np.rint(shares * optimiser.height / optimiser.gene_steps), 0, optimiser.gene_max_units)
+        units = units.astype(optimiser.gene_dtype)
+        optimiser.repair_units(units, np.random.default_rng(0))
+        fits = optimiser.evaluate_population(optimiser.decode(units))
+        return polish(optimiser, units[int(np.argmax(fits))], polish_steps).tolist()
+
+    def save(self, path):
+        columns = sorted(self.features)
+        np.savez(path, columns=np.array(columns), neighbours=self.neighbours,
+                 **{f"features_{c}": self.features[c] for c in columns}, **{f"layouts_{c}": self.layouts[c] for c in columns})
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            columns = [int(c) for c in data["columns"]]
+            return cls({c: data[f"features_{c}"] for c in columns}, {c: data[f"layouts_{c}"] for c in columns},
+                       int(data["neighbours"]))
+
+    def __repr__(self):
+        """Content hash, so result store keys change when the model is retrained"""
+        digest = hashlib.sha256(str(self.neighbours).encode())
+        for columns in sorted(self.features):
+            digest.update(self.features[columns].tobytes())
+            digest.update(self.layouts[columns].tobytes())
+        return f"SurrogateModel({digest.hexdigest()[:16]})"
+
+
+def default_model():
+    """The model at DEFAULT_MODEL_PATH, reloaded when the file changes, or None when there is none"""
+    global _default_model
+    try:
+        mtime = os.path.getmtime(DEFAULT_MODEL_PATH)
+    except OSError:
+        return None
+    if _default_model[0] != mtime:
+        _default_model = (mtime, SurrogateModel.load(DEFAULT_MODEL_PATH))
+    return _default_model[1]
+
+
+def polish(optimiser, units, steps=20):
+    """Hill climb from a genome in gene units: each step scores every one-step move and every
+    move of one step between two genes in a single batch"""
+    size = len(units)
+    single = np.eye(size, dtype=np.int64)
+    first, second = np.nonzero(~np.eye(size, dtype=bool))
+    moves = np.concatenate([single, -single, single[first] - single[second]])
+    current = units.astype(np.int64)
+    fitness = optimiser.evaluate_population(optimiser.decode(current[np.newaxis]))[0]
+    for _ in range(steps):
+        neighbours = np.clip(current + moves, 0, optimiser.gene_max_units)
+        fits = optimiser.evaluate_population(neighbours * optimiser.gene_steps)
+        best = int(np.argmax(fits))
+        if fits[best] <= fitness:
+            break
+        current, fitness = neighbours[best], fits[best]
+    return optimiser.decode(current.astype(optimiser.gene_dtype))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train the layout surrogate on a grid of GA results.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    train = subparsers.add_parser("train", help="Run the GA over the training grid and fit the model")
+    train.add_argument("-o", "--output", default=DEFAULT_MODEL_PATH, help="Model file (default: the shared model)")
+    train.add_argument("--step", type=int, default=25, help="Preference grid step in percent")
+    train.add_argument("-w", "--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    specs = training_specs(step=args.step)
+    print(f"Optimising {len(specs)} training specs", file=sys.stderr)
+    model = SurrogateModel().fit(build_training_set(specs, workers=args.workers))
+    if os.path.dirname(args.output):
+        os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    model.save(args.output)
+    print(f"Saved {model!r} for column counts {sorted(model.features)} to {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,50 +1,150 @@
-import matplotlib.pyplot as plt
+import io
+import threading
 
-def visualise_closet(arrangement, width, height, columns):
-    fig, ax = plt.subplots(figsize=(10, 8))
-    colors = {"drawers": "orange", "shelves": "green", "short_hanging": "blue", "long_hanging": "purple"}
+COLORS = {"drawers": "orange", "shelves": "green", "short_hanging": "blue", "long_hanging": "purple"}
+
+_local = threading.local()  # One cached renderer per thread, matplotlib figures are not thread safe
+
+
+def closet_rectangles(arrangement, width, columns):
+    """Stack each column's components bottom up, returning (x, y, width, height, component) per drawn rectangle"""
     col_width = width / columns
-    column_positions = [((col + 0.5) * col_width - width / 2) for col in range(columns)]
-
-    for col_index, x_position in enumerate(column_positions):
-        y_start = 0
-        for (column, component), comp_height in arrangement.items():
-            if column == col_index and comp_height > 0:
-                ax.bar(
-                    x_position,
-                    comp_height,
-                    width=col_width,
-                    bottom=y_start,
-                    color=colors.get(component, "grey"),
-                    edgecolor="black"
-                )
-                if comp_height > 128:
-                    ax.text(
-                        x_position,
-                        y_start + comp_height / 2,
-                        f"{component}\n{comp_height} mm",
-                        ha="center",
-                        va="center",
-                        color="white",
-                        fontsize=10
-                    )
-                else:
-                    ax.text(
-                        x_position,
-                        y_start + comp_height / 2,
-                        f"{component} {comp_height} mm",
-                        ha="center",
-                        va="center",
-                        color="white",
-                        fontsize=10
-                    )
-                y_start += comp_height
-
-    ax.set_xlim(-width / 2, width / 2)
-    ax.set_ylim(0, height)
-    ax.set_title("Closet Space Arrangement")
-    ax.set_xlabel("Width (mm)")
-    ax.set_ylabel("Height (mm)")
-    plt.grid(visible=False)
-    
-    return fig
\ No newline at end of file
+    bottoms = [0] * columns
+    rectangles = []
+    for (column, component), comp_height in arrangement.items():
+        if 0 <= column < columns and comp_height > 0:
+            rectangles.append((column * col_width - width / 2, bottoms[column], col_width, comp_height, component))
+            bottoms[column] += comp_height
+    return rectangles
+
+
+class ClosetRenderer:
+    """Draw arrangements into one reusable figure with a single PolyCollection for the rectangles.
+
+    The figure, axes, collection and label artists are built once and updated in place on each
+    render, so rendering thousands of designs does not build or leak figures. Without ax the
+    renderer owns an Agg backed figure and never touches pyplot.
+    """
+
+    def __init__(self, ax=None, figsize=(10, 8), dpi=100, labels=True):
+        from matplotlib.collections import PolyCollection
+
+        if ax is None:
+            from matplotlib.backends.backend_agg import FigureCanvasAgg
+            from matplotlib.figure import Figure
+
+            fig = Figure(figsize=figsize, dpi=dpi)
+            FigureCanvasAgg(fig)
+            ax = fig.add_subplot()
+        self.ax = ax
+        self.figure = ax.figure
+        self.labels = labels
+        self.texts = []  # Label pool, grown as needed and hidden when unused
+        self.collection = PolyCollection([], edgecolors="black")
+        ax.add_collection(self.collection)
+        ax.set_title("Closet Space Arrangement")
+        ax.set_xlabel("Width (mm)")
+        ax.set_ylabel("Height (mm)")
+        ax.grid(visible=False)
+
+    def render(self, arrangement, width, height, columns):
+        """Update the figure to show an arrangement and return it"""
+        rectangles = closet_rectangles(arrangement, width, columns)
+        self.collection.set_verts([
+            [(x, y), (x + w, y), (x + w, y + h), (x, y + h)] for x, y, w, h, _ in rectangles
+        ])
+        self.collection.set_facecolor([COLORS.get(component, "grey") for *_, component in rectangles])
+
+        shown = rectangles if self.labels else []
+        while len(self.texts) < len(shown):
+            self.texts.append(self.ax.text(0, 0, "", ha="center", va="center", color="white", fontsize=10))
+        for text, (x, y, w, h, component) in zip(self.texts, shown):
+            separator = "\n" if h > 128 else " "
+            text.set_position((x + w / 2, y + h / 2))
+            text.set_text(f"{component}{separator}{h} mm")
+            text.set_visible(True)
+        for text in self.texts[len(shown):]:
+            text.set_visible(False)
+
+        self.ax.set_xlim(-width / 2, width / 2)
+        self.ax.set_ylim(0, height)
+        return self.figure
+
+    def save(self, target=None, format="png", dpi=None):
+        """Write the current figure to a path or file object, with no target return the encoded bytes"""
+        buffer = io.BytesIO() if target is None else target
+        self.figure.savefig(buffer, format=format, dpi=dpi)
+        return buffer.getvalue() if target is None else None
+
+
+def progress_figure(logbook=None, figsize=(10, 6), dpi=100):
+    """Max and average fitness per generation on a pyplot-free figure, with no logbook the lines start empty"""
+    from matplotlib.figure import Figure
+
+    if logbook is None:
+        generations = max_fitness = avg_fitness = []
+    else:
+        generations, max_fitness, avg_fitness = logbook.select("gen", "max", "avg")
+
+    fig = Figure(figsize=figsize, dpi=dpi)
+    ax = fig.add_subplot()
+    ax.plot(generations, max_fitness, label="Max Fitness", color="blue")
+    ax.plot(generations, avg_fitness, label="Average Fitness", color="green")
+    ax.set_title("Algorithm Progress")
+    ax.set_xlabel("Generations")
+    ax.set_ylabel("Fitness")
+    ax.legend(loc="best")
+    ax.grid(True)
+    return fig
+
+
+class LiveFigures:
+    """The GUI's closet and progress figures, built once and updated in place for every run.
+
+    Only artist data changes between runs, so the canvases embedding these figures can be kept
+    for the whole session and redrawn with draw_idle().
+    """
+
+    def __init__(self, closet_figsize=(10, 8), progress_figsize=(10, 6), dpi=100):
+        self.closet = ClosetRenderer(figsize=closet_figsize, dpi=dpi)
+        self.progress = progress_figure(figsize=progress_figsize, dpi=dpi)
+        self.figures = [self.closet.figure, self.progress]
+
+    def reset(self, width, height, columns):
+        """Empty closet and fitness curve for a new run"""
+        self.closet.render({}, width, height, columns)
+        self.show_progress([], [], [])
+
+    def show(self, arrangement, width, height, columns, generations, max_fitness, avg_fitness):
+        """Show the latest best arrangement and the fitness history so far"""
+        self.closet.render(arrangement, width, height, columns)
+        self.show_progress(generations, max_fitness, avg_fitness)
+
+    def show_progress(self, generations, max_fitness, avg_fitness):
+        ax = self.progress.axes[0]
+        max_line, avg_line = ax.get_lines()
+        max_line.set_data(generations, max_fitness)
+        avg_line.set_data(generations, avg_fitness)
+        ax.relim()
+        ax.autoscale_view()
+
+    def draw_idle(self):
+        for figure in self.figures:
+            figure.canvas.draw_idle()
+
+
+def visualise_closet(arrangement, width, height, columns, ax=None):
+    """Draw the arrangement on a new figure, or into ax when redrawing an existing figure"""
+    return ClosetRenderer(ax).render(arrangement, width, height, columns)
+
+
+def render_closet(arrangement, width, height, columns, target=None, format="png", figsize=(5, 4), dpi=72, labels=True):
+    """Export an arrangement as PNG or SVG to a path, file object or bytes (target=None).
+
+    Reuses this thread's cached renderer when the size and labels match, for bulk thumbnails.
+    """
+    key = (figsize, dpi, labels)
+    if getattr(_local, "key", None) != key:
+        _local.renderer, _local.key = ClosetRenderer(figsize=figsize, dpi=dpi, labels=labels), key
+    _local.renderer.render(arrangement, width, height, columns)
+    return _local.renderer.save(target, format)
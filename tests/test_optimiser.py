@@ -0,0 +1,535 @@
+import csv
+import io
+import itertools
+import json
+import os
+import pickle
+import random
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from benchmarks.gui_memory import run_session
+from benchmarks.startup import probe, IMPORT_PROBE, LAZY_MODULES
+from optimiser.adaptive import AdaptiveController
+from optimiser.batch import read_specs, run_batch
+from optimiser.cache import FitnessCache
+from optimiser.designer import ClosetDesigner
+from optimiser.decompose import split_budget
+from optimiser.exact import solve_exact
+from optimiser.optimiser_core import INDPB, ClosetOptimiser, columns_for_width
+from optimiser.parallel import EvaluationPool
+from optimiser.pareto import non_dominated_ranks
+from optimiser.profiling import profiling
+from optimiser.service import OptimisationService
+from optimiser.stats import RingBufferSink
+from optimiser.store import ResultStore
+from optimiser.surrogate import SurrogateModel, build_training_set, training_specs
+from optimiser.visualiser import ClosetRenderer, render_closet
+
+
+PREFERENCES = [
+    {"shelves": 30, "drawers": 20, "short_hanging": 50, "long_hanging": 0},
+    {"shelves": 25, "drawers": 25, "short_hanging": 25, "long_hanging": 25},
+    {"shelves": 100, "drawers": 0, "short_hanging": 0, "long_hanging": 0},
+]
+ALG_PREF = {"Population": 50, "Generations": 5}
+
+
+class TestEvaluatePopulation(unittest.TestCase):
+    def test_matches_scalar_evaluate(self):
+        """Batch scores must equal the scalar reference, including penalised genomes."""
+        rng = random.Random(0)
+        for preferences in PREFERENCES:
+            optimiser = ClosetOptimiser(2540, 2176, preferences, ALG_PREF)
+            size = optimiser.columns * len(optimiser.components)
+            genomes = [optimiser.toolbox.individual() for _ in range(200)]
+            genomes += [[rng.randint(0, 2 * optimiser.height) for _ in range(size)] for _ in range(200)]
+
+            batch = optimiser.evaluate_population(genomes)
+            scalar = [optimiser.evaluate(genome)[0] for genome in genomes]
+            self.assertEqual(batch.tolist(), scalar)
+
+    def test_deviation_uses_arrangement_shares(self):
+        """The preference term is computed from each component's real share of the closet."""
+        optimiser = ClosetOptimiser(2540, 2176, PREFERENCES[0], ALG_PREF)
+        capacity = optimiser.columns * optimiser.height
+        units = optimiser.initial_population(20, rng=np.random.default_rng(0))
+        optimiser.repair_units(units, np.random.default_rng(1))  # Feasible, so only the preference and unused terms count
+        genomes = [optimiser.heuristic_genome()] + optimiser.decode(units).tolist()
+        for genome in genomes:
+            arrangement = optimiser.map_individual_to_arrangement(genome)
+            shares = {component: 0 for component in optimiser.components}
+            for (_, component), height in arrangement.items():
+                shares[component] += height / capacity * 100
+            deviation = sum(abs(shares[component] - target) for component, target in optimiser.preferences.items())
+            expected = -deviation - (capacity - sum(genome)) / 50
+            self.assertAlmostEqual(optimiser.evaluate(genome)[0], expected)
+        self.assertEqual(optimiser.evaluate_population(genomes).tolist(), [optimiser.evaluate(genome)[0] for genome in genomes])
+
+
+class TestParallelEvaluation(unittest.TestCase):
+    def test_parallel_run_matches_serial_run(self):
+        """A seeded run gives the same best individual with or without the worker pool."""
+        serial = ClosetOptimiser(2540, 2176, PREFERENCES[0], ALG_PREF)
+        serial_best, _ = serial.optimise(seed=42)
+
+        with EvaluationPool(processes=2) as pool:
+            parallel = ClosetOptimiser(2540, 2176, PREFERENCES[0], ALG_PREF, pool=pool)
+            parallel_best, _ = parallel.optimise(seed=42)
+
+        self.assertEqual(list(parallel_best), list(serial_best))
+        self.assertEqual(parallel_best.fitness.values, serial_best.fitness.values)
+
+    def test_workers_keep_the_optimiser_between_generations(self):
+        """Only the first call for an optimiser ships its state, later calls send genome chunks alone."""
+        optimisers = [ClosetOptimiser(2540, 2176, preferences, ALG_PREF) for preferences in PREFERENCES[:2]]
+        with EvaluationPool(processes=2) as pool:
+            sent_state = []
+            pool_map = pool._pool.map
+            pool._pool.map = lambda function, tasks: sent_state.append([task[1] is not None for task in tasks]) or pool_map(function, tasks)
+            for _ in range(3):
+                for optimiser in optimisers:
+                    genomes = optimiser.decode(optimiser.initial_population(40, rng=np.random.default_rng(0)))
+                    self.assertEqual(pool.evaluate(optimiser, genomes).tolist(), optimiser.evaluate_population(genomes).tolist())
+        # Every generation is 4 chunks, a shorter call resends chunks a worker had no optimiser for
+        generations = [calls for calls in sent_state if len(calls) == 4]
+        self.assertEqual([any(calls) for calls in generations], [True, True, False, False, False, False])
+        self.assertTrue(all(all(calls) for calls in sent_state if len(calls) < 4))
+
+
+class TestConcurrentOptimisers(unittest.TestCase):
+    def test_no_cross_talk_between_threads(self):
+        """Seeded optimisers give identical results whether run one by one or all at once."""
+        jobs = [(preferences, seed) for preferences in PREFERENCES for seed in range(4)]
+
+        def run(job):
+            preferences, seed = job
+            optimiser = ClosetOptimiser(2540, 2176, preferences, {"Population": 60, "Generations": 15})
+            best, _ = optimiser.optimise(seed=seed, plot=False)
+            return list(best), best.fitness.values, list(optimiser.logbook.select("avg"))
+
+        sequential = [run(job) for job in jobs]
+        with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+            for _ in range(3):
+                self.assertEqual(list(executor.map(run, jobs)), sequential)
+
+
+class TestFitnessCache(unittest.TestCase):
+    def test_only_unseen_genomes_are_scored(self):
+        cache = FitnessCache(maxsize=2)
+        scored = []
+
+        def score(individuals):
+            scored.extend(individuals)
+            return [(sum(individual),) for individual in individuals]
+
+        self.assertEqual(cache.evaluate([[1, 2], [1, 2], [3, 4]], score), [(3,), (3,), (7,)])
+        self.assertEqual(cache.evaluate([[3, 4], [5, 6]], score), [(7,), (11,)])
+        self.assertEqual(scored, [[1, 2], [3, 4], [5, 6]])
+        self.assertEqual((cache.hits, cache.misses), (2, 3))
+
+        # [1, 2] was least recently used, so it was evicted to make room for [5, 6]
+        cache.evaluate([[1, 2]], score)
+        self.assertEqual(cache.misses, 4)
+        self.assertEqual(len(cache), 2)
+
+
+class TestEarlyStopping(unittest.TestCase):
+    def test_stop_reason_and_best_so_far(self):
+        optimiser = ClosetOptimiser(2540, 2176, PREFERENCES[0], ALG_PREF)
+        best, _ = optimiser.optimise(generations=1000, patience=3, seed=1)
+        self.assertEqual(optimiser.logbook.stop_reason, "patience")
+        self.assertLess(len(optimiser.logbook), 1000)
+        self.assertGreaterEqual(best.fitness.values[0], max(optimiser.logbook.select("max")))
+
+        best, _ = optimiser.optimise(generations=1000, target_fitness=best.fitness.values[0], seed=1)
+        self.assertEqual(optimiser.logbook.stop_reason, "target")
+
+
+class TestRepairAndMutation(unittest.TestCase):
+    def test_repair_keeps_columns_within_height_on_the_grid(self):
+        optimiser = ClosetOptimiser(2540, 2176, PREFERENCES[1], ALG_PREF)
+        units = np.random.default_rng(0).integers(0, optimiser.gene_max_units + 1, size=(500, len(optimiser.gene_steps)))
+        units = units.astype(optimiser.gene_dtype)
+        shape = (len(units), optimiser.columns, -1)  # Gene col * K + k
+        self.assertTrue((optimiser.decode(units).reshape(shape).sum(axis=2) > optimiser.height).any())
+
+        optimiser.repair_units(units, np.random.default_rng(1))
+        genomes = optimiser.decode(units)
+        self.assertTrue((genomes.reshape(shape).sum(axis=2) <= optimiser.height).all())
+        self.assertTrue((genomes % optimiser.gene_steps == 0).all())
+
+    def test_mutation_redraws_genes_at_indpb(self):
+        """Each gene of a mutant is redrawn with probability indpb, and never without mutation."""
+        optimiser = ClosetOptimiser(2540, 2176, PREFERENCES[1], ALG_PREF)
+        unreachable = optimiser.gene_max_units.max() + 1  # Any redrawn gene moves off this value
+        parents = np.full((2000, len(optimiser.gene_steps)), unreachable, dtype=optimiser.gene_dtype)
+        offspring = np.empty_like(parents)
+        for indpb in (0.1, 0.25, 0.6):
+            optimiser.vary_units(parents, offspring, 0.0, 1.0, np.random.default_rng(0), indpb)
+            self.assertAlmostEqual((offspring != unreachable).mean(), indpb, delta=0.01)
+        optimiser.vary_units(parents, offspring, 0.0, 0.0, np.random.default_rng(0), 1.0)
+        self.assertTrue((offspring == unreachable).all())
+
+        # The list-based reference path mutates at the same default rate
+        optimiser.rng.seed(0)
+        genes = [gene for _ in range(2000) for gene in optimiser.toolbox.mutate([-1] * len(optimiser.gene_steps))[0]]
+        self.assertAlmostEqual(np.mean(np.array(genes) != -1), INDPB, delta=0.01)
+
+
+class TestStatsSinks(unittest.TestCase):
+    def test_sinks_and_recording_interval(self):
+        optimiser = ClosetOptimiser(2540, 2176, PREFERENCES[0], {"Population": 30, "Generations": 10})
+        ring = RingBufferSink(size=3)
+        best, fig = optimiser.optimise(seed=1, stats_sink=ring, stats_every=4)
+        self.assertEqual(ring.select("gen"), [4, 8, 9])  # Oldest records dropped, last generation always kept
+        self.assertEqual(optimiser.logbook.stop_reason, "generations")
+        self.assertIsNotNone(fig)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "stats.csv")
+            _, fig = optimiser.optimise(seed=1, stats_sink=path, stats_every=4, plot=False)
+            with open(path, newline="") as f:
+                rows = list(csv.DictReader(f))
+        self.assertIsNone(fig)
+        self.assertEqual([row["gen"] for row in rows], ["0", "4", "8", "9"])
+        self.assertEqual(float(rows[-1]["max"]), ring.select("max")[-1])
+
+        # The closed file sink stays behind when workers or islands pickle the optimiser
+        copy = pickle.loads(pickle.dumps(optimiser))
+        self.assertIsNone(copy.logbook)
+        self.assertEqual(copy.evaluate(list(best)), optimiser.evaluate(list(best)))
+
+
+class TestRenderer(unittest.TestCase):
+    def test_cached_renderer_exports_png_and_svg(self):
+        arrangement = {(0, "shelves"): 800, (0, "drawers"): 448, (1, "short_hanging"): 928, (1, "drawers"): 0}
+        self.assertTrue(render_closet(arrangement, 2540, 2176, 4).startswith(b"\x89PNG"))
+        self.assertIn(b"<svg", render_closet(arrangement, 2540, 2176, 4, format="svg"))
+
+        renderer = ClosetRenderer()
+        renderer.render(arrangement, 2540, 2176, 4)
+        renderer.render({(0, "shelves"): 2176}, 2540, 2176, 4)
+        self.assertEqual(len(renderer.collection.get_paths()), 1)
+        self.assertEqual([text.get_visible() for text in renderer.texts], [True, False, False])
+
+
+class TestLiveFigures(unittest.TestCase):
+    def test_100_optimisations_do_not_grow_memory(self):
+        """The GUI's persistent figures are updated in place, so a long session does not leak."""
+        report = run_session(runs=100, warmup=5, generations=3, draw_every=20)
+        self.assertLess(report["heap_growth_mb"], 1)
+
+
+class TestResultStore(unittest.TestCase):
+    def test_repeated_queries_are_served_from_disk(self):
+        specs = [{"id": str(seed), "width": 2540, "height": 2176, "drawers": 20, "short_hanging": 50, "seed": seed}
+                 for seed in range(4)]
+        defaults = {"population": 30, "generations": 5, "seed": None, "engine": "ga"}
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "results.sqlite3")
+            runs = []
+            for _ in range(2):
+                output = io.StringIO()
+                run_batch(specs, output, workers=2, defaults=defaults, store=ResultStore(path).path)
+                runs.append(sorted((json.loads(line) for line in output.getvalue().splitlines()), key=lambda r: r["id"]))
+            self.assertEqual(len(ResultStore(path)), 4)
+
+            self.assertEqual([result["cached"] for result in runs[0] + runs[1]], [False] * 4 + [True] * 4)
+            for first, second in zip(*runs):
+                self.assertEqual(first["best_individual"], second["best_individual"])
+                self.assertEqual(first["fitness"], second["fitness"])
+
+            # A different parameter is a different key
+            optimiser = ClosetOptimiser(2540, 2176, PREFERENCES[0], {"Population": 30, "Generations": 5})
+            best, _, hit = ResultStore(path).optimise(optimiser, seed=0, mutpb=0.3, plot=False)
+            self.assertFalse(hit)
+            stored, _, hit = ResultStore(path).optimise(optimiser, seed=0, mutpb=0.3, plot=False)
+            self.assertTrue(hit)
+            self.assertEqual((list(stored), stored.fitness.values), (list(best), best.fitness.values))
+
+            # load answers the cold seeded query without running, warm or unseeded queries never hit
+            stored, _ = ResultStore(path).load(optimiser, seed=0, mutpb=0.3, plot=False)
+            self.assertEqual(list(stored), list(best))
+            self.assertIsNone(ResultStore(path).load(optimiser, seed=0, mutpb=0.3, plot=False, warm_start=True))
+            self.assertIsNone(ResultStore(path).load(optimiser, seed=1, mutpb=0.3, plot=False))
+
+            # Runs that may not repeat are never stored
+            for options in ({}, {"seed": 0, "time_budget": 60.0}, {"seed": 0, "warm_start": True}):
+                _, _, hit = ResultStore(path).optimise(optimiser, plot=False, **options)
+                self.assertFalse(hit)
+            self.assertEqual(len(ResultStore(path)), 5)
+
+
+class TestBatch(unittest.TestCase):
+    def test_malformed_lines_become_error_lines(self):
+        """One bad JSONL line is reported on its own line and the rest of the batch still runs."""
+        lines = ['{"width": 2540, "height": 2176, "drawers": 20, "short_hanging": 50, "seed": 0, "error": ""}', '{"width": 2540,',
+                 '[1, 2]', '{"width": null, "height": 2176}']
+        defaults = {"population": 20, "generations": 3, "seed": None, "engine": "ga"}
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "specs.jsonl")
+            with open(path, "w") as f:
+                f.write("\n".join(lines) + "\n")
+            output = io.StringIO()
+            failures = run_batch(read_specs(path), output, workers=1, defaults=defaults)
+        results = {result["id"]: result for result in map(json.loads, output.getvalue().splitlines())}
+        self.assertEqual(failures, 3)
+        self.assertIn("fitness", results["1"])
+        self.assertTrue(results["2"]["error"].startswith("JSONDecodeError"))
+        self.assertTrue(results["3"]["error"].startswith("ValueError"))
+        self.assertTrue(results["4"]["error"].startswith("TypeError"))
+
+        # A CSV column called error is just data
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "specs.csv")
+            with open(path, "w") as f:
+                f.write("width,height,drawers,short_hanging,seed,error\n2540,2176,20,50,0,none\n")
+            output = io.StringIO()
+            self.assertEqual(run_batch(read_specs(path), output, workers=1, defaults=defaults), 0)
+        self.assertIn("fitness", json.loads(output.getvalue()))
+
+
+class TestService(unittest.TestCase):
+    def test_duplicates_share_a_run_and_errors_map_to_status(self):
+        service = OptimisationService(workers=1, timeout=30.0).start()
+        try:
+            spec = {"width": 2540, "height": 2176, "drawers": 20, "short_hanging": 50, "seed": 1,
+                    "population": 30, "generations": 5}
+            with ThreadPoolExecutor(4) as executor:
+                answers = list(executor.map(service.optimise, [dict(spec) for _ in range(4)]))
+            self.assertEqual({status for status, _ in answers}, {200})
+            self.assertEqual(len({json.dumps(result["best_individual"]) for _, result in answers}), 1)
+
+            for bad in ({"width": 2540}, dict(spec, width=None), dict(spec, width=[1])):
+                status, _ = service.optimise(bad)
+                self.assertEqual(status, 400)
+            status, _ = service.optimise(dict(spec, seed=2, generations=200, timeout=0.001))
+            self.assertEqual(status, 504)
+
+            metrics = service.metrics()
+            self.assertEqual((metrics["requests"], metrics["completed"], metrics["errors"], metrics["timeouts"]), (8, 4, 3, 1))
+            self.assertGreaterEqual(metrics["deduplicated"], 1)
+        finally:
+            service.close()
+
+
+class TestProfiling(unittest.TestCase):
+    def test_phase_times_and_counts(self):
+        optimiser = ClosetOptimiser(2540, 2176, PREFERENCES[0], ALG_PREF)
+        seen = []
+        with profiling(optimiser, callback=lambda gen, timings: seen.append(gen)) as profiler:
+            optimiser.optimise(seed=1, repair=False, plot=False)
+        self.assertIsNone(optimiser.profiler)
+        self.assertEqual(seen, list(range(5)))
+
+        report = optimiser.profile
+        self.assertIs(optimiser.logbook.profile, report)
+        self.assertEqual(report, profiler.report())
+        self.assertTrue(all(report["seconds"][name] > 0 for name in ("vary", "evaluate", "select", "stats")))
+        self.assertEqual(report["seconds"]["repair"], 0)
+        counts = report["counts"]
+        self.assertEqual(counts["offspring"], 5 * 50)
+        self.assertEqual(counts["evaluations"] + counts["cache_hits"], counts["offspring"])
+        self.assertGreater(report["infeasible_share"], 0)
+
+        optimiser.optimise(seed=1, plot=False)
+        self.assertIsNone(optimiser.profile)
+
+
+class TestWarmStart(unittest.TestCase):
+    def test_warm_start_reuses_population_on_new_height_grid(self):
+        ClosetOptimiser.warm_populations.clear()
+        first = ClosetOptimiser(2540, 2176, PREFERENCES[0], ALG_PREF)
+        first.optimise(seed=1, warm_start=True)
+        stored = ClosetOptimiser.warm_populations[first.warm_start_key()]
+
+        nudged = ClosetOptimiser(2540, 2080, {"shelves": 29, "drawers": 21, "short_hanging": 50}, ALG_PREF)
+        population = nudged.decode(nudged.initial_population(len(stored) + 10, warm_start=True))
+        self.assertEqual(population[:len(stored)].tolist(), [nudged.snap_to_grid(genome) for genome in stored])
+        self.assertTrue((population <= nudged.height).all())
+
+
+class TestClosetDesigner(unittest.TestCase):
+    def test_greedy_layout_preview_and_seed(self):
+        for preferences in PREFERENCES:
+            optimiser = ClosetOptimiser(2540, 2176, preferences, ALG_PREF)
+            designer = ClosetDesigner(2540, 2176, optimiser.columns)
+            designer.design_closet(optimiser.preferences)
+            for intervals in designer.occupancy.values():
+                # Blocks are stacked from the floor without gaps and fit the column
+                self.assertEqual([bottom for bottom, _, _ in intervals], [0] + [top for _, top, _ in intervals[:-1]])
+                self.assertLessEqual(sum(top - bottom for bottom, top, _ in intervals), 2176)
+
+            preview, _ = optimiser.optimise(engine="heuristic", plot=False)
+            self.assertEqual(optimiser.logbook.stop_reason, "heuristic")
+            self.assertEqual(list(preview), optimiser.heuristic_genome())
+            population = optimiser.decode(optimiser.initial_population(10, heuristic_seeds=3))
+            self.assertEqual(population[0].tolist(), list(preview))
+
+
+class TestDecomposition(unittest.TestCase):
+    def test_columns_follow_width(self):
+        self.assertEqual([columns_for_width(width) for width in (500, 2540, 5000, 10000)], [1, 4, 8, 16])
+        self.assertEqual(ClosetOptimiser(5000, 2176, PREFERENCES[0], ALG_PREF).columns, 8)
+
+    def test_decomposed_genome_fits_and_matches_pool(self):
+        optimiser = ClosetOptimiser(10000, 2176, PREFERENCES[1], ALG_PREF)
+        targets = split_budget(optimiser)
+        self.assertTrue((targets.sum(axis=1) <= optimiser.height).all())
+
+        best, _ = optimiser.optimise(engine="decompose", plot=False)
+        columns = [best[col * 4:(col + 1) * 4] for col in range(optimiser.columns)]
+        self.assertTrue(all(sum(column) <= optimiser.height for column in columns))
+        with EvaluationPool(processes=2) as pool:
+            parallel = ClosetOptimiser(10000, 2176, PREFERENCES[1], ALG_PREF, pool=pool)
+            self.assertEqual(list(parallel.optimise(engine="decompose", plot=False)[0]), list(best))
+
+
+class TestSurrogate(unittest.TestCase):
+    def test_trained_model_predicts_feasible_layouts(self):
+        specs = training_specs(widths=(2540,), heights=(1600, 2176), step=50)
+        model = SurrogateModel().fit(build_training_set(specs, {"Population": 30, "Generations": 5}, workers=1))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "surrogate.npz")
+            model.save(path)
+            self.assertEqual(repr(SurrogateModel.load(path)), repr(model))
+
+        optimiser = ClosetOptimiser(2400, 2080, PREFERENCES[0], ALG_PREF)
+        best, _ = optimiser.optimise(engine="surrogate", surrogate=model, plot=False)
+        self.assertEqual(optimiser.logbook.stop_reason, "surrogate")
+        columns = [best[col * 3:(col + 1) * 3] for col in range(optimiser.columns)]
+        self.assertTrue(all(sum(column) <= optimiser.height for column in columns))
+
+        # No model for 8 columns, so the GA answers
+        wide = ClosetOptimiser(5000, 2176, PREFERENCES[0], ALG_PREF)
+        wide.optimise(engine="surrogate", surrogate=model, plot=False)
+        self.assertEqual(wide.logbook.stop_reason, "generations")
+
+
+class TestParetoFront(unittest.TestCase):
+    def test_ranks_match_deap_and_front_covers_trade_offs(self):
+        from deap import base, tools
+
+        rng = random.Random(0)
+        points = [(rng.randrange(20), rng.randrange(20)) for _ in range(200)]  # Ties and duplicates
+        fitness_class = type("FitnessMin", (base.Fitness,), {"weights": (-1.0, -1.0)})
+        individuals = [type("Point", (), {})() for _ in points]
+        for individual, point in zip(individuals, points):
+            individual.fitness = fitness_class(point)
+        expected = {}
+        for rank, front in enumerate(tools.sortNondominated(individuals, len(individuals))):
+            expected.update((id(individual), rank) for individual in front)
+        self.assertEqual(non_dominated_ranks(points).tolist(), [expected[id(individual)] for individual in individuals])
+
+        optimiser = ClosetOptimiser(2540, 2176, PREFERENCES[0], ALG_PREF)
+        best, _ = optimiser.optimise(engine="nsga2", seed=0, population_size=60, generations=20, plot=False)
+        front = optimiser.pareto_front
+        self.assertGreater(len(front), 1)
+        self.assertTrue((non_dominated_ranks(front.points) == 0).all())
+        self.assertEqual(list(best), front.genome(1.0))
+        self.assertAlmostEqual(best.fitness.values[0], -front.points[front.pick(1.0)].sum())
+        self.assertEqual(front.points[front.pick(0.0), 0], front.points[:, 0].min())  # Closest match to the preferences
+        self.assertEqual(front.points[front.pick(1e6), 1], front.points[:, 1].min())  # Least unused space
+
+        # The deviation objective is the arrangement's real shares against the preferences
+        pick = front.pick(0.0)
+        capacity = optimiser.columns * optimiser.height
+        shares = {component: 0 for component in optimiser.components}
+        for (_, component), height in optimiser.map_individual_to_arrangement(front.genomes[pick].tolist()).items():
+            shares[component] += height / capacity * 100
+        self.assertAlmostEqual(front.points[pick, 0], sum(abs(shares[c] - t) for c, t in optimiser.preferences.items()))
+
+
+class TestAdaptiveOperators(unittest.TestCase):
+    def test_settings_adapt_within_ranges_and_runs_repeat(self):
+        optimiser = ClosetOptimiser(4200, 2176, PREFERENCES[1], ALG_PREF)
+        runs = []
+        for _ in range(2):
+            controller = AdaptiveController()
+            best, _ = optimiser.optimise(seed=3, generations=30, adaptive=controller, plot=False)
+            runs.append((list(best), controller.history))
+        self.assertEqual(runs[0], runs[1])
+        history = runs[0][1]
+        self.assertEqual(len(history), 30)
+        self.assertGreater(len({(h["cxpb"], h["mutpb"], h["tournsize"]) for h in history}), 1)
+        for h in history:
+            self.assertTrue(h["cxpb"] == 0.5 and 0.05 <= h["mutpb"] <= 0.2 and 3 <= h["tournsize"] <= 6)
+            self.assertGreaterEqual(min(h["shares"]), 0.1 - 1e-9)
+
+        for engine in ("nsga2", "islands"):  # Engines without a controller refuse rather than ignore it
+            with self.assertRaises(ValueError):
+                optimiser.optimise(engine=engine, generations=1, adaptive=True, plot=False)
+
+        # Column crossover swaps whole columns between the two parents
+        parents = optimiser.initial_population(40, rng=np.random.default_rng(0))
+        offspring = np.empty_like(parents)
+        crossed = optimiser.vary_units(parents, offspring, 1.0, 0.0, np.random.default_rng(1), crossover=np.full(20, 2))
+        self.assertTrue(crossed.all())
+        columns = lambda units: units.reshape(len(units), optimiser.columns, -1)
+        first, second, child = columns(parents[0::2]), columns(parents[1::2]), columns(offspring[0::2])
+        self.assertTrue(((child == first).all(axis=2) | (child == second).all(axis=2)).all())
+
+
+class TestIslands(unittest.TestCase):
+    def test_same_result_in_process_and_across_workers(self):
+        """Each island owns its RNG stream, so the process count does not change a seeded run."""
+        results = []
+        for processes in (0, 2):
+            optimiser = ClosetOptimiser(2540, 2176, PREFERENCES[0], {"Population": 80, "Generations": 12})
+            best, _ = optimiser.optimise_islands(islands=3, migration_interval=4, processes=processes, seed=5, plot=False)
+            results.append((list(best), best.fitness.values, optimiser.logbook.select("max")))
+            self.assertEqual(len(optimiser.logbook), 12)
+        self.assertEqual(results[0], results[1])
+
+
+class TestExactSolver(unittest.TestCase):
+    def test_matches_brute_force(self):
+        """The exact engine finds the best genome of a lattice small enough to enumerate."""
+        preferences = {"drawers": 30, "short_hanging": 40, "long_hanging": 30}
+        optimiser = ClosetOptimiser(2540, 1200, preferences, ALG_PREF)
+        steps = [optimiser.min_heights[component] for component in optimiser.components] * optimiser.columns
+        lattice = list(itertools.product(*[range(0, optimiser.height + 1, step) for step in steps]))
+
+        best, _ = optimiser.optimise(engine="exact")
+        self.assertEqual(best.fitness.values[0], optimiser.evaluate_population(lattice).max())
+
+    def test_totals_state_matches_brute_force(self):
+        """Deviation is charged on each component's total over every column, not on runs of genes."""
+        specs = [(1800, 2000, {"drawers": 40, "short_hanging": 60}),
+                 (1300, 1100, {"shelves": 20, "drawers": 30, "short_hanging": 50})]  # Shelves fill the leftover space
+        for width, height, preferences in specs:
+            optimiser = ClosetOptimiser(width, height, preferences, ALG_PREF)
+            steps = [optimiser.min_heights[component] for component in optimiser.components] * optimiser.columns
+            lattice = np.array(list(itertools.product(*[range(0, optimiser.height + 1, step) for step in steps])))
+
+            genome = solve_exact(optimiser)
+            self.assertAlmostEqual(optimiser.evaluate(genome)[0], optimiser.evaluate_population(lattice).max())
+
+    def test_standard_closet_solves_exactly(self):
+        """A full four-component closet is solved by the DP, not the GA fallback, and no GA run beats it."""
+        preferences = {"shelves": 25, "drawers": 25, "short_hanging": 25, "long_hanging": 25}
+        optimiser = ClosetOptimiser(2540, 2176, preferences, ALG_PREF)
+        best, _ = optimiser.optimise(engine="exact", plot=False)
+        self.assertEqual(optimiser.logbook.stop_reason, "exact")
+        ga_best, _ = optimiser.optimise(seed=0, population_size=200, generations=50, plot=False)
+        self.assertGreaterEqual(best.fitness.values[0], ga_best.fitness.values[0])
+
+    def test_large_lattice_returns_none(self):
+        optimiser = ClosetOptimiser(2540, 2176, PREFERENCES[1], ALG_PREF)
+        self.assertIsNone(solve_exact(optimiser, max_work=1000))
+
+
+class TestLazyImports(unittest.TestCase):
+    def test_cold_import_skips_heavy_modules(self):
+        """DEAP, matplotlib and the TkAgg backend must only load when first used."""
+        for module in ("gui", "optimiser.optimiser_core"):
+            result = probe(IMPORT_PROBE.format(module=module, lazy=LAZY_MODULES))
+            self.assertEqual(result.get("loaded"), [], msg=f"{module}: {result}")
+
+
+if __name__ == "__main__":
+    unittest.main()